@@ -1,6 +1,6 @@
 {
     "name": "Account Move Change Journal",
-    "version": "18.0.1.5.0",
+    "version": "18.0.1.24.0",
     "category": "Accounting",
     "summary": "Change journal of account moves with proper field recalculation",
     "author": "Vikingo Software SAS",
@@ -11,8 +11,13 @@
     ],
     "data": [
         "security/ir.model.access.csv",
+        "data/ir_cron.xml",
         "wizards/account_move_change_journal_views.xml",
         "views/account_move_views.xml",
+        "views/account_move_change_journal_job_views.xml",
+        "views/account_move_change_journal_log_views.xml",
+        "views/account_move_change_journal_rule_views.xml",
+        "views/account_move_change_journal_run_views.xml",
     ],
     "installable": True,
     "application": False,
@@ -0,0 +1,8 @@
+from . import account_journal
+from . import account_payment_method_line
+from . import res_company
+from . import account_move_change_journal_job
+from . import account_move_change_journal_log
+from . import account_move_change_journal_rule
+from . import account_move_change_journal_run
+from . import account_move_change_journal_snapshot
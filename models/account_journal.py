@@ -0,0 +1,70 @@
+from odoo import api, models
+from odoo.tools import ormcache
+
+# Journal fields the journal change compatibility index depends on
+CHANGE_JOURNAL_COMPATIBILITY_FIELDS = {
+    "type",
+    "company_id",
+    "active",
+    "inbound_payment_method_line_ids",
+    "outbound_payment_method_line_ids",
+}
+
+
+class AccountJournal(models.Model):
+    _inherit = "account.journal"
+
+    @api.model
+    @ormcache("company_id")
+    def _get_change_journal_compatibility(self, company_id):
+        """Compatibility index of the journals of a company as journal change targets
+
+        Returns a dict {journal_id: values} where values holds the journal
+        type, the availability of inbound and outbound payments ('ok',
+        'no_method' or 'no_account'), the available inbound and outbound
+        payment method codes and whether the company uses receiptbooks.
+
+        The index is cached per company and cleared whenever a journal, a
+        payment method line or the company outstanding accounts change. The
+        returned dict is shared, it must not be modified.
+        """
+        journals = self.sudo().search([("company_id", "=", company_id)])
+        company = self.env["res.company"].sudo().browse(company_id)
+        default_accounts = {
+            "inbound": bool(company.account_journal_payment_debit_account_id),
+            "outbound": bool(company.account_journal_payment_credit_account_id),
+        }
+        use_receiptbook = bool(getattr(company, "use_receiptbook", False))
+
+        index = {}
+        for journal in journals:
+            values = {
+                "type": journal.type,
+                "use_receiptbook": use_receiptbook,
+            }
+            for payment_type in ("inbound", "outbound"):
+                method_lines = journal._get_available_payment_method_lines(payment_type)
+                if not method_lines:
+                    availability = "no_method"
+                elif method_lines.filtered("payment_account_id") or default_accounts[payment_type]:
+                    availability = "ok"
+                else:
+                    availability = "no_account"
+                values[payment_type] = availability
+                values[f"{payment_type}_codes"] = frozenset(method_lines.mapped("code"))
+            index[journal.id] = values
+        return index
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if CHANGE_JOURNAL_COMPATIBILITY_FIELDS.intersection(vals):
+            self.env.registry.clear_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env.registry.clear_cache()
+        return super().unlink()
@@ -0,0 +1,478 @@
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import AccessError
+from odoo.fields import Command
+from odoo.tools import SQL
+
+from ..wizards.account_move_change_journal import _ChunkFailure
+
+# Crons processing the jobs, each one can run a job in parallel with the others
+PROCESSING_CRON_XMLIDS = [
+    "account_move_change_journal.ir_cron_process_change_journal_jobs",
+    "account_move_change_journal.ir_cron_process_change_journal_jobs_2",
+    "account_move_change_journal.ir_cron_process_change_journal_jobs_3",
+]
+
+
+class AccountMoveChangeJournalJob(models.Model):
+    _name = "account.move.change.journal.job"
+    _description = "Journal Change Background Job"
+    _order = "id desc"
+
+    name = fields.Char(
+        string="Name",
+        required=True,
+        readonly=True,
+    )
+    state = fields.Selection(
+        [
+            ("queued", "Queued"),
+            ("running", "Running"),
+            ("done", "Done"),
+            ("failed", "Done with Errors"),
+            ("cancel", "Cancelled"),
+        ],
+        string="Status",
+        default="queued",
+        required=True,
+        readonly=True,
+    )
+    user_id = fields.Many2one(
+        "res.users",
+        string="Requested by",
+        default=lambda self: self.env.user,
+        required=True,
+        readonly=True,
+    )
+    company_id = fields.Many2one(
+        "res.company",
+        string="Company",
+        required=True,
+        readonly=True,
+    )
+    journal_to_id = fields.Many2one(
+        "account.journal",
+        string="New Journal",
+        required=True,
+        readonly=True,
+    )
+    reset_sequence = fields.Boolean(
+        string="Reset Sequence",
+        readonly=True,
+    )
+    force_change = fields.Boolean(
+        string="Force Change",
+        readonly=True,
+    )
+    bulk_mode = fields.Boolean(
+        string="Bulk Mode",
+        readonly=True,
+    )
+    lock_records = fields.Boolean(
+        string="Lock Records",
+        readonly=True,
+    )
+    isolate_failures = fields.Boolean(
+        string="Keep Successful Changes",
+        readonly=True,
+    )
+    audit_mode = fields.Selection(
+        [
+            ("chatter", "Chatter Message per Record"),
+            ("log", "Change Log"),
+        ],
+        string="Audit Trail",
+        default="chatter",
+        readonly=True,
+    )
+    audit_summary = fields.Boolean(
+        string="Summary Message",
+        readonly=True,
+    )
+    batch_ref = fields.Char(
+        string="Batch Reference",
+        readonly=True,
+    )
+    chunk_size = fields.Integer(
+        string="Chunk Size",
+        readonly=True,
+    )
+    chunk_ids = fields.One2many(
+        "account.move.change.journal.job.chunk",
+        "job_id",
+        string="Chunks",
+        readonly=True,
+    )
+    move_count = fields.Integer(
+        string="Number of Moves",
+        readonly=True,
+    )
+    processed_move_count = fields.Integer(
+        string="Processed Moves",
+        compute="_compute_progress",
+    )
+    changed_move_count = fields.Integer(
+        string="Changed Moves",
+        compute="_compute_progress",
+    )
+    changed_payment_count = fields.Integer(
+        string="Changed Payments",
+        compute="_compute_progress",
+    )
+    failed_chunk_count = fields.Integer(
+        string="Failed Chunks",
+        compute="_compute_progress",
+    )
+    progress = fields.Float(
+        string="Progress",
+        compute="_compute_progress",
+    )
+    date_start = fields.Datetime(
+        string="Started on",
+        readonly=True,
+    )
+    date_end = fields.Datetime(
+        string="Finished on",
+        readonly=True,
+    )
+    date_eta = fields.Datetime(
+        string="Estimated End",
+        compute="_compute_progress",
+    )
+    run_id = fields.Many2one(
+        "account.move.change.journal.run",
+        string="Run",
+        readonly=True,
+        help="Run recording the measures and the snapshot of all the chunks of the job",
+    )
+
+    @api.depends("chunk_ids.state", "move_count", "date_start")
+    def _compute_progress(self):
+        now = fields.Datetime.now()
+        for job in self:
+            processed_chunks = job.chunk_ids.filtered(lambda c: c.state in ("done", "failed"))
+            job.processed_move_count = sum(processed_chunks.mapped("move_count"))
+            job.changed_move_count = sum(processed_chunks.mapped("changed_move_count"))
+            job.changed_payment_count = sum(processed_chunks.mapped("changed_payment_count"))
+            job.failed_chunk_count = len(processed_chunks.filtered(lambda c: c.state == "failed"))
+            job.progress = (
+                100.0 * job.processed_move_count / job.move_count if job.move_count else 0.0
+            )
+
+            # Estimate the end from the throughput observed since the job started
+            job.date_eta = False
+            if job.state == "running" and job.date_start and job.processed_move_count:
+                elapsed = (now - job.date_start).total_seconds()
+                remaining = job.move_count - job.processed_move_count
+                job.date_eta = now + timedelta(
+                    seconds=elapsed * remaining / job.processed_move_count
+                )
+
+    @api.model
+    def _prepare_chunk_values(self, move_ids, chunk_size):
+        """Split the move ids into chunk creation commands"""
+        commands = []
+        for sequence, start in enumerate(range(0, len(move_ids), chunk_size)):
+            commands.append(Command.create({
+                "sequence": sequence,
+                "move_ids": [Command.set(move_ids[start:start + chunk_size])],
+            }))
+        return commands
+
+    def _trigger_processing(self):
+        """Wake up the crons processing the queued jobs, one worker per job at most"""
+        job_count = self.search_count([("state", "in", ("queued", "running"))])
+        for xmlid in PROCESSING_CRON_XMLIDS[:max(job_count, 1)]:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron:
+                cron.sudo()._trigger()
+
+    def action_process(self):
+        """Resume the job in the next cron run"""
+        self.filtered(lambda j: j.state in ("queued", "running"))._trigger_processing()
+
+    def action_cancel(self):
+        """Cancel the job, chunks already processed are kept
+
+        Users only read jobs, they can cancel the ones they requested.
+        """
+        jobs = self.filtered(lambda j: j.state in ("queued", "running"))
+        if not self.env.user.has_group("account.group_account_manager") and any(
+            job.create_uid != self.env.user for job in jobs
+        ):
+            raise AccessError(_("You can only cancel the journal change jobs you requested."))
+        jobs.sudo().write({
+            "state": "cancel",
+            "date_end": fields.Datetime.now(),
+        })
+
+    def _update_state(self):
+        """Close the job once every chunk has been processed"""
+        for job in self:
+            if job.chunk_ids.filtered(lambda c: c.state == "pending"):
+                continue
+            failed = job.chunk_ids.filtered(lambda c: c.state == "failed")
+            job.write({
+                "state": "failed" if failed else "done",
+                "date_end": fields.Datetime.now(),
+            })
+
+    def _get_processing_env(self):
+        """Environment the chunks of the job are processed in
+
+        Jobs are only created by the wizard, as superuser, so their creator is
+        the user who validated the change, unlike user_id which a manager can
+        edit.
+        """
+        self.ensure_one()
+        return self.with_user(self.create_uid).with_company(self.company_id).env
+
+    def _prepare_wizard_values(self):
+        """Values of the wizard applying the options of the job"""
+        self.ensure_one()
+        return {
+            "journal_to_id": self.journal_to_id.id,
+            "reset_sequence": self.reset_sequence,
+            "force_change": self.force_change,
+            "bulk_mode": self.bulk_mode,
+            "lock_records": self.lock_records,
+            "isolate_failures": self.isolate_failures,
+            "audit_mode": self.audit_mode,
+            "audit_summary": self.audit_summary,
+            "batch_ref": self.batch_ref,
+        }
+
+    def _prepare_execution(self):
+        """Execution shared by the chunks of the job, recorded in a single run
+
+        Returns a tuple (wizard, execution), see
+        account.move.change.journal._prepare_execution().
+        """
+        self.ensure_one()
+        wizard = self._get_processing_env()["account.move.change.journal"].create(
+            self._prepare_wizard_values()
+        )
+        if not self.run_id:
+            self.run_id = wizard._create_run()
+        return wizard, wizard._prepare_execution(self.run_id.with_env(wizard.env))
+
+    def _process_chunks(self):
+        """Process the pending chunks of the job, committing after each one
+
+        Chunks are only marked as done in the same transaction that applies
+        their changes, so after a worker crash the job resumes from the first
+        chunk that was not committed. All the chunks share the payment
+        resolver and the run of the job.
+        """
+        self.ensure_one()
+        if self.state == "queued":
+            self.write({
+                "state": "running",
+                "date_start": fields.Datetime.now(),
+            })
+        wizard, execution = self._prepare_execution()
+        self.env.cr.commit()
+
+        for chunk in self.chunk_ids.filtered(lambda c: c.state == "pending").sorted("sequence"):
+            # The job may have been cancelled from the interface meanwhile
+            self.invalidate_recordset(["state"])
+            if self.state == "cancel":
+                break
+            chunk._process(execution)
+            self.env.cr.commit()
+        else:
+            self._update_state()
+        # Once per job, including the chunks committed before a worker crash
+        wizard._finish_execution(execution, {
+            "changed_moves": self.chunk_ids.changed_move_ids,
+            "changed_payments": self.chunk_ids.changed_payment_ids,
+        })
+        self.env.cr.commit()
+
+    def _try_lock(self):
+        """Take a session-level advisory lock on the job
+
+        Unlike row locks it survives the commits done after each chunk, so
+        each job is processed by a single worker while the other processing
+        crons pick up the remaining jobs.
+        """
+        self.ensure_one()
+        self.env.cr.execute(SQL(
+            "SELECT pg_try_advisory_lock(hashtext(%s), %s)", self._name, self.id
+        ))
+        return self.env.cr.fetchone()[0]
+
+    def _unlock(self):
+        """Release the advisory lock taken by _try_lock()"""
+        self.ensure_one()
+        self.env.cr.execute(SQL(
+            "SELECT pg_advisory_unlock(hashtext(%s), %s)", self._name, self.id
+        ))
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Process the queued and interrupted jobs not taken by another worker"""
+        jobs = self.search([("state", "in", ("queued", "running"))], order="id")
+        for job in jobs:
+            if not job._try_lock():
+                continue
+            try:
+                job._process_chunks()
+            finally:
+                job._unlock()
+
+
+class AccountMoveChangeJournalJobChunk(models.Model):
+    _name = "account.move.change.journal.job.chunk"
+    _description = "Journal Change Background Job Chunk"
+    _order = "job_id, sequence"
+
+    job_id = fields.Many2one(
+        "account.move.change.journal.job",
+        string="Job",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    sequence = fields.Integer(
+        string="Sequence",
+        default=0,
+    )
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        string="Status",
+        default="pending",
+        required=True,
+    )
+    move_ids = fields.Many2many(
+        "account.move",
+        "account_move_change_journal_chunk_move_rel",
+        "chunk_id",
+        "move_id",
+        string="Moves",
+    )
+    changed_move_ids = fields.Many2many(
+        "account.move",
+        "account_move_change_journal_chunk_changed_move_rel",
+        "chunk_id",
+        "move_id",
+        string="Changed Moves",
+    )
+    changed_payment_ids = fields.Many2many(
+        "account.payment",
+        "account_move_change_journal_chunk_changed_payment_rel",
+        "chunk_id",
+        "payment_id",
+        string="Changed Payments",
+    )
+    skipped_move_ids = fields.Many2many(
+        "account.move",
+        "account_move_change_journal_chunk_skipped_move_rel",
+        "chunk_id",
+        "move_id",
+        string="Skipped Moves",
+        help="Moves locked by another transaction when the chunk was processed",
+    )
+    move_count = fields.Integer(
+        string="Number of Moves",
+        compute="_compute_counts",
+        store=True,
+    )
+    changed_move_count = fields.Integer(
+        string="Changed Moves",
+        compute="_compute_counts",
+        store=True,
+    )
+    changed_payment_count = fields.Integer(
+        string="Changed Payments",
+        compute="_compute_counts",
+        store=True,
+    )
+    error_message = fields.Text(
+        string="Errors",
+    )
+    date_done = fields.Datetime(
+        string="Processed on",
+    )
+
+    @api.depends("move_ids", "changed_move_ids", "changed_payment_ids")
+    def _compute_counts(self):
+        for chunk in self:
+            chunk.move_count = len(chunk.move_ids)
+            chunk.changed_move_count = len(chunk.changed_move_ids)
+            chunk.changed_payment_count = len(chunk.changed_payment_ids)
+
+    def _prepare_wizard_values(self):
+        """Values of the wizard used to apply the change of this chunk"""
+        return dict(self.job_id._prepare_wizard_values(), move_ids=[Command.set(self.move_ids.ids)])
+
+    def _lock_target_journal(self):
+        """Serialize the chunks renumbering moves in the same target journal
+
+        Jobs sharing a target journal would otherwise compete for its sequence
+        and its unique name index. The transaction-level advisory lock is
+        released by the commit following the chunk, so the jobs interleave
+        chunk by chunk.
+        """
+        self.ensure_one()
+        self.env.cr.execute(SQL(
+            "SELECT pg_advisory_xact_lock(hashtext(%s), %s)", "account.journal", self.job_id.journal_to_id.id
+        ))
+
+    def _process(self, execution):
+        """Apply the journal change to the moves of the chunk
+
+        The chunk is a batch of the execution of its job, see
+        AccountMoveChangeJournalJob._prepare_execution().
+        """
+        self.ensure_one()
+        job = self.job_id
+        env = job._get_processing_env()
+        wizard = env["account.move.change.journal"].create(self._prepare_wizard_values())
+        moves = wizard.move_ids.filtered(lambda m: m.journal_id != job.journal_to_id)
+
+        if job.reset_sequence:
+            self._lock_target_journal()
+
+        # Snapshot rows of a chunk rolled back must not be stored with the next one
+        checkpoint = execution["snapshot"].checkpoint()
+        try:
+            with self.env.cr.savepoint():
+                # The moves may have changed since the job was queued
+                if moves:
+                    wizard._validate_change()
+                result = wizard._process_change(moves, execution)
+                # Without isolation a failing payment or move can leave the rest
+                # of its group changed, roll back the whole chunk as the wizard does
+                if result["errors"] and not wizard.isolate_failures:
+                    raise _ChunkFailure(result["errors"])
+        except _ChunkFailure as e:
+            execution["snapshot"].restore(checkpoint)
+            self.write({
+                "state": "failed",
+                "error_message": "\n".join(e.errors),
+                "date_done": fields.Datetime.now(),
+            })
+            return
+        except Exception as e:
+            execution["snapshot"].restore(checkpoint)
+            self.write({
+                "state": "failed",
+                "error_message": str(e),
+                "date_done": fields.Datetime.now(),
+            })
+            return
+
+        self.write({
+            "state": "failed" if result["errors"] else "done",
+            "changed_move_ids": [Command.set(result["changed_moves"].ids)],
+            "changed_payment_ids": [Command.set(result["changed_payments"].ids)],
+            "skipped_move_ids": [Command.set(result["skipped_moves"].ids)],
+            "error_message": "\n".join(result["errors"]) or False,
+            "date_done": fields.Datetime.now(),
+        })
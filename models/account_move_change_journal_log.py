@@ -0,0 +1,76 @@
+from odoo import fields, models
+
+
+class AccountMoveChangeJournalLog(models.Model):
+    _name = "account.move.change.journal.log"
+    _description = "Journal Change Log"
+    _order = "id desc"
+    _rec_name = "new_name"
+
+    batch_ref = fields.Char(
+        string="Batch Reference",
+        required=True,
+        index=True,
+        readonly=True,
+    )
+    record_type = fields.Selection(
+        [
+            ("move", "Move"),
+            ("payment", "Payment"),
+        ],
+        string="Record Type",
+        required=True,
+        readonly=True,
+    )
+    move_id = fields.Many2one(
+        "account.move",
+        string="Move",
+        index=True,
+        ondelete="set null",
+        readonly=True,
+    )
+    payment_id = fields.Many2one(
+        "account.payment",
+        string="Payment",
+        index="btree_not_null",
+        ondelete="set null",
+        readonly=True,
+    )
+    company_id = fields.Many2one(
+        "res.company",
+        string="Company",
+        readonly=True,
+    )
+    user_id = fields.Many2one(
+        "res.users",
+        string="User",
+        readonly=True,
+    )
+    old_journal_id = fields.Many2one(
+        "account.journal",
+        string="Old Journal",
+        readonly=True,
+    )
+    new_journal_id = fields.Many2one(
+        "account.journal",
+        string="New Journal",
+        readonly=True,
+    )
+    old_name = fields.Char(
+        string="Old Number",
+        readonly=True,
+    )
+    new_name = fields.Char(
+        string="New Number",
+        readonly=True,
+    )
+    old_payment_method_line_id = fields.Many2one(
+        "account.payment.method.line",
+        string="Old Payment Method",
+        readonly=True,
+    )
+    new_payment_method_line_id = fields.Many2one(
+        "account.payment.method.line",
+        string="New Payment Method",
+        readonly=True,
+    )
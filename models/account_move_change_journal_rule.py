@@ -0,0 +1,294 @@
+import logging
+from ast import literal_eval
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
+from odoo.fields import Command
+from odoo.osv import expression
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+_logger = logging.getLogger(__name__)
+
+
+class AccountMoveChangeJournalRule(models.Model):
+    _name = "account.move.change.journal.rule"
+    _description = "Journal Change Rule"
+    _order = "sequence, id"
+
+    name = fields.Char(
+        string="Name",
+        required=True,
+    )
+    active = fields.Boolean(
+        string="Active",
+        default=True,
+    )
+    sequence = fields.Integer(
+        string="Sequence",
+        default=10,
+    )
+    company_id = fields.Many2one(
+        "res.company",
+        string="Company",
+        required=True,
+        default=lambda self: self.env.company,
+    )
+    move_domain = fields.Char(
+        string="Moves to Change",
+        required=True,
+        default="[]",
+        help="Domain on journal entries selecting the moves this rule applies to",
+    )
+    journal_to_id = fields.Many2one(
+        "account.journal",
+        string="New Journal",
+        required=True,
+        domain="[('company_id', '=', company_id)]",
+    )
+    reset_sequence = fields.Boolean(
+        string="Reset Sequence",
+        default=True,
+        help="If checked, the moves will get a new sequence number from the target journal",
+    )
+    force_change = fields.Boolean(
+        string="Force Change",
+        default=False,
+        help="Also change posted moves locked by hash (use with caution)",
+    )
+    audit_mode = fields.Selection(
+        [
+            ("chatter", "Chatter Message per Record"),
+            ("log", "Change Log"),
+        ],
+        string="Audit Trail",
+        default="log",
+        required=True,
+    )
+    batch_size = fields.Integer(
+        string="Batch Size",
+        default=500,
+        help="Number of moves changed and committed together",
+    )
+    last_write_date = fields.Datetime(
+        string="Last Write Date",
+        readonly=True,
+        copy=False,
+        help="High-water mark: moves last modified before this date have already been evaluated",
+    )
+    last_move_id = fields.Integer(
+        string="Last Move ID",
+        readonly=True,
+        copy=False,
+    )
+    failed_move_ids = fields.Many2many(
+        "account.move",
+        "account_move_change_journal_rule_failed_move_rel",
+        "rule_id",
+        "move_id",
+        string="Moves to Retry",
+        readonly=True,
+        copy=False,
+        help="Moves left unchanged by a previous run, already behind the high-water mark, "
+             "retried at the start of the next run",
+    )
+    last_run_date = fields.Datetime(
+        string="Last Run",
+        readonly=True,
+        copy=False,
+    )
+    last_run_move_count = fields.Integer(
+        string="Moves Changed in Last Run",
+        readonly=True,
+        copy=False,
+    )
+    last_run_error = fields.Text(
+        string="Errors of Last Run",
+        readonly=True,
+        copy=False,
+    )
+
+    def init(self):
+        # Keyset pagination of _fetch_next_batch() on account_move
+        create_index(
+            self.env.cr,
+            "account_move_write_date_id_index",
+            "account_move",
+            ["write_date", "id"],
+        )
+
+    @api.constrains("batch_size")
+    def _check_batch_size(self):
+        for rule in self:
+            if rule.batch_size <= 0:
+                raise ValidationError(_("The batch size must be greater than zero."))
+
+    def _get_move_domain(self):
+        """Domain of the moves still to be changed by the rule"""
+        self.ensure_one()
+        domain = [
+            ("company_id", "=", self.company_id.id),
+            ("journal_id", "!=", self.journal_to_id.id),
+        ]
+        if not self.force_change:
+            domain += ["|", ("state", "!=", "posted"), ("restrict_mode_hash_table", "=", False)]
+        return expression.AND([literal_eval(self.move_domain or "[]"), domain])
+
+    @api.model
+    def _get_overlap_margin(self):
+        """Margin re-scanned before the high-water mark at the start of each run
+
+        write_date is the start of the writing transaction, so moves committed
+        by a long transaction after a run can have a write_date before its
+        mark. Set by the system parameter
+        account_move_change_journal.rule_overlap_minutes (10 by default).
+        """
+        minutes = self.env["ir.config_parameter"].sudo().get_param(
+            "account_move_change_journal.rule_overlap_minutes", "10"
+        )
+        return timedelta(minutes=int(minutes))
+
+    def _fetch_next_batch(self, query, write_date, move_id):
+        """Fetch the next batch of (id, write_date) after the given high-water mark
+
+        Moves are paginated by (write_date, id) so each run only goes through
+        the moves created or modified since the previous one.
+        """
+        condition = SQL("TRUE")
+        if write_date:
+            condition = SQL("(move.write_date, move.id) > (%s, %s)", write_date, move_id)
+        self.env.cr.execute(SQL("""
+            SELECT move.id, move.write_date
+              FROM account_move move
+             WHERE move.id IN (%s)
+               AND %s
+          ORDER BY move.write_date, move.id
+             LIMIT %s
+        """, query.subselect(), condition, self.batch_size))
+        return self.env.cr.fetchall()
+
+    def _prepare_wizard_values(self, move_ids):
+        """Values of the wizard used to apply the rule to a batch of moves"""
+        self.ensure_one()
+        return {
+            "move_ids": [Command.set(move_ids)],
+            "journal_to_id": self.journal_to_id.id,
+            "reset_sequence": self.reset_sequence,
+            "force_change": self.force_change,
+            "bulk_mode": True,
+            "isolate_failures": True,
+            "audit_mode": self.audit_mode,
+        }
+
+    def _process_batch(self, move_ids, batch_ref, execution):
+        """Apply the rule to a batch of moves, as part of the execution of the current run"""
+        self.ensure_one()
+        wizard = self.env["account.move.change.journal"].with_company(self.company_id).create(
+            dict(self._prepare_wizard_values(move_ids), batch_ref=batch_ref)
+        )
+        return wizard._process_change(wizard.move_ids, execution)
+
+    @api.model
+    def _get_retry_move_ids(self, result):
+        """Ids of the moves of a batch result to retry on the next run"""
+        return [failure["move_id"] for failure in result["failures"]] + result["skipped_moves"].ids
+
+    def _apply(self):
+        """Apply the rule to the moves modified since its last run, committing after each batch"""
+        self.ensure_one()
+        Move = self.env["account.move"].with_company(self.company_id)
+        Move.flush_model()
+        domain = self._get_move_domain()
+        query = Move._search(domain)
+
+        # A single execution, and run, for all the batches of this run of the rule
+        wizard = self.env["account.move.change.journal"].with_company(self.company_id).create(
+            self._prepare_wizard_values([])
+        )
+        execution = wizard._prepare_execution()
+        results = []
+
+        # The moves left unchanged by the previous runs are behind the mark,
+        # retry the ones still matching the rule first
+        if self.failed_move_ids:
+            retry_ids = Move.search(domain + [("id", "in", self.failed_move_ids.ids)], order="id").ids
+            failed_ids = []
+            for start in range(0, len(retry_ids), self.batch_size):
+                result = self._process_batch(
+                    retry_ids[start:start + self.batch_size], wizard.batch_ref, execution,
+                )
+                results.append(result)
+                failed_ids += self._get_retry_move_ids(result)
+            self.failed_move_ids = [Command.set(failed_ids)]
+            self.env.cr.commit()
+
+        write_date, move_id = self.last_write_date, self.last_move_id
+        mark = (write_date, move_id) if write_date else None
+        if write_date:
+            # Re-scan a safety margin, the moves already changed by the rule
+            # have left its domain
+            write_date, move_id = write_date - self._get_overlap_margin(), 0
+        while True:
+            rows = self._fetch_next_batch(query, write_date, move_id)
+            if not rows:
+                break
+            move_ids = [row[0] for row in rows]
+            # Keep the exact high-water mark for the next batch of this run, the
+            # changed moves get a new write_date but leave the domain of the rule
+            move_id, write_date = rows[-1]
+            # Moves of the safety margin do not move the mark back
+            if mark is None or (write_date, move_id) > mark:
+                mark = (write_date, move_id)
+
+            result = self._process_batch(move_ids, wizard.batch_ref, execution)
+            results.append(result)
+            self.write({
+                "last_write_date": mark[0],
+                "last_move_id": mark[1],
+                "failed_move_ids": [Command.link(failed_id) for failed_id in self._get_retry_move_ids(result)],
+            })
+            self.env.cr.commit()
+
+        result = wizard._merge_results(results)
+        if results:
+            wizard._finish_execution(execution, result)
+        self.write({
+            "last_run_date": fields.Datetime.now(),
+            "last_run_move_count": len(result["changed_moves"]),
+            "last_run_error": "\n".join(result["errors"]) or False,
+        })
+        self.env.cr.commit()
+
+    def action_reset_high_water_mark(self):
+        """Evaluate again every move matching the rule on its next run"""
+        self.write({
+            "last_write_date": False,
+            "last_move_id": 0,
+            "failed_move_ids": [Command.clear()],
+        })
+
+    def action_run(self):
+        """Run the rules in the next cron execution"""
+        self.env.ref(
+            "account_move_change_journal.ir_cron_apply_change_journal_rules"
+        )._trigger()
+
+    @api.model
+    def _cron_apply_rules(self):
+        """Apply every active rule to the moves modified since its last run
+
+        A rule failing unexpectedly is rolled back to its last committed batch
+        and its error recorded, without stopping the next rules.
+        """
+        for rule in self.search([]):
+            try:
+                rule._apply()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.exception("Journal change rule %s failed", rule.name)
+                rule.write({
+                    "last_run_date": fields.Datetime.now(),
+                    "last_run_error": str(e),
+                })
+                self.env.cr.commit()
@@ -0,0 +1,268 @@
+from collections import defaultdict
+
+from psycopg2.errors import UniqueViolation
+
+from odoo import _, fields, models
+from odoo.exceptions import UserError
+from odoo.fields import Command
+from odoo.tools import SQL
+
+
+class AccountMoveChangeJournalRun(models.Model):
+    _name = "account.move.change.journal.run"
+    _description = "Journal Change Run"
+    _order = "id desc"
+    _rec_name = "batch_ref"
+
+    batch_ref = fields.Char(
+        string="Batch Reference",
+        index=True,
+        readonly=True,
+    )
+    company_id = fields.Many2one(
+        "res.company",
+        string="Company",
+        readonly=True,
+    )
+    journal_to_id = fields.Many2one(
+        "account.journal",
+        string="New Journal",
+        readonly=True,
+    )
+    journal_to_ids = fields.Many2many(
+        "account.journal",
+        string="New Journals",
+        readonly=True,
+        help="Target journals of the run, several ones in mapping mode",
+    )
+    user_id = fields.Many2one(
+        "res.users",
+        string="User",
+        readonly=True,
+    )
+    changed_move_count = fields.Integer(
+        string="Changed Moves",
+        readonly=True,
+    )
+    changed_payment_count = fields.Integer(
+        string="Changed Payments",
+        readonly=True,
+    )
+    skipped_move_count = fields.Integer(
+        string="Skipped Moves",
+        readonly=True,
+    )
+    error_count = fields.Integer(
+        string="Errors",
+        readonly=True,
+    )
+    partial_count = fields.Integer(
+        string="Partial Reconciles Removed",
+        readonly=True,
+    )
+    full_reconcile_count = fields.Integer(
+        string="Full Reconciles Removed",
+        readonly=True,
+    )
+    duration = fields.Float(
+        string="Duration (s)",
+        digits=(16, 3),
+        readonly=True,
+    )
+    query_count = fields.Integer(
+        string="SQL Queries",
+        readonly=True,
+    )
+    stage_ids = fields.One2many(
+        "account.move.change.journal.run.stage",
+        "run_id",
+        string="Stages",
+        readonly=True,
+    )
+    state = fields.Selection(
+        [
+            ("done", "Done"),
+            ("reverted", "Reverted"),
+        ],
+        string="Status",
+        default="done",
+        required=True,
+        readonly=True,
+    )
+    date_reverted = fields.Datetime(
+        string="Reverted On",
+        readonly=True,
+    )
+    snapshot_count = fields.Integer(
+        string="Snapshot Rows",
+        readonly=True,
+    )
+
+    def _store_snapshot(self, snapshot):
+        """Add the values collected by a batch of the run, needed to revert it
+
+        _revert() applies the snapshot with SQL, so its rows are only written
+        here as superuser, users can read them but not create them.
+        """
+        self.ensure_one()
+        run = self.sudo()
+        run.env["account.move.change.journal.snapshot"].create([
+            dict(values, run_id=run.id) for values in snapshot.records
+        ])
+        run.env["account.move.change.journal.snapshot.partial"].create([
+            dict(values, run_id=run.id) for values in snapshot.partials
+        ])
+        run.snapshot_count += len(snapshot.records)
+
+    def action_revert(self):
+        """Put the moves and payments of the run back in their old journal"""
+        for run in self:
+            if run.state == "reverted":
+                raise UserError(_("Run %s has already been reverted.") % run.batch_ref)
+            try:
+                with self.env.cr.savepoint():
+                    run._revert()
+            except UniqueViolation:
+                raise UserError(_(
+                    "Run %s cannot be reverted: some of the old numbers have been "
+                    "used again in their journal."
+                ) % run.batch_ref) from None
+            run.write({
+                "state": "reverted",
+                "date_reverted": fields.Datetime.now(),
+            })
+
+    def _revert(self):
+        """Restore the snapshot of the run in bulk
+
+        Moves, move lines and payments are restored with one UPDATE each,
+        joined on the snapshot rows. Only the records still in the journal
+        they were changed to are restored, so later changes are not overwritten. The
+        removed partial reconciles are then created again in a single batch
+        and grouped back into their full reconciles. Exchange difference
+        moves removed with them are not restored.
+        """
+        self.ensure_one()
+        self.env.flush_all()
+        cr = self.env.cr
+
+        cr.execute(SQL("""
+            UPDATE account_move move
+               SET journal_id = snapshot.old_journal_id,
+                   name = snapshot.old_name,
+                   sequence_prefix = snapshot.old_sequence_prefix,
+                   sequence_number = snapshot.old_sequence_number,
+                   write_date = NOW(),
+                   write_uid = %(uid)s
+              FROM account_move_change_journal_snapshot snapshot
+             WHERE snapshot.run_id = %(run_id)s
+               AND snapshot.record_type = 'move'
+               AND move.id = snapshot.move_id
+               AND move.journal_id = snapshot.new_journal_id
+         RETURNING move.id
+        """, uid=self.env.uid, run_id=self.id))
+        move_ids = [row[0] for row in cr.fetchall()]
+        if move_ids:
+            cr.execute(SQL("""
+                UPDATE account_move_line line
+                   SET journal_id = move.journal_id,
+                       move_name = move.name
+                  FROM account_move move
+                 WHERE move.id = ANY(%s)
+                   AND line.move_id = move.id
+            """, move_ids))
+
+        cr.execute(SQL("""
+            UPDATE account_payment payment
+               SET journal_id = snapshot.old_journal_id,
+                   payment_method_line_id = snapshot.old_payment_method_line_id,
+                   receiptbook_id = NULLIF(snapshot.old_receiptbook_id, 0),
+                   write_date = NOW(),
+                   write_uid = %(uid)s
+              FROM account_move_change_journal_snapshot snapshot
+             WHERE snapshot.run_id = %(run_id)s
+               AND snapshot.record_type = 'payment'
+               AND payment.id = snapshot.payment_id
+               AND payment.journal_id = snapshot.new_journal_id
+        """, uid=self.env.uid, run_id=self.id))
+        self.env.invalidate_all()
+
+        self._restore_reconciles()
+
+    def _restore_reconciles(self):
+        """Create again the partial and full reconciles removed by the run"""
+        partials = self.env["account.move.change.journal.snapshot.partial"].search([
+            ("run_id", "=", self.id),
+            ("debit_move_id", "!=", False),
+            ("credit_move_id", "!=", False),
+        ])
+        if not partials:
+            return
+        new_partials = self.env["account.partial.reconcile"].create([
+            {
+                "debit_move_id": partial.debit_move_id.id,
+                "credit_move_id": partial.credit_move_id.id,
+                "amount": partial.amount,
+                "debit_amount_currency": partial.debit_amount_currency,
+                "credit_amount_currency": partial.credit_amount_currency,
+            }
+            for partial in partials
+        ])
+
+        full_groups = defaultdict(lambda: self.env["account.partial.reconcile"])
+        for partial, new_partial in zip(partials, new_partials):
+            if partial.full_reconcile_ref:
+                full_groups[partial.full_reconcile_ref] |= new_partial
+        # The partials of a full reconcile that were not touched by the run are
+        # still there, they are grouped back with the recreated ones
+        vals_list = []
+        for group in full_groups.values():
+            lines = group.debit_move_id | group.credit_move_id
+            group |= lines.matched_debit_ids | lines.matched_credit_ids
+            lines = group.debit_move_id | group.credit_move_id
+            if lines.full_reconcile_id:
+                continue
+            vals_list.append({
+                "partial_reconcile_ids": [Command.set(group.ids)],
+                "reconciled_line_ids": [Command.set(lines.ids)],
+            })
+        if vals_list:
+            self.env["account.full.reconcile"].create(vals_list)
+
+
+class AccountMoveChangeJournalRunStage(models.Model):
+    _name = "account.move.change.journal.run.stage"
+    _description = "Journal Change Run Stage"
+    _order = "run_id, sequence"
+
+    run_id = fields.Many2one(
+        "account.move.change.journal.run",
+        string="Run",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    sequence = fields.Integer(
+        string="Sequence",
+    )
+    name = fields.Char(
+        string="Stage",
+        required=True,
+    )
+    duration = fields.Float(
+        string="Duration (s)",
+        digits=(16, 3),
+    )
+    query_count = fields.Integer(
+        string="SQL Queries",
+    )
+    row_count = fields.Integer(
+        string="Rows",
+    )
+    call_count = fields.Integer(
+        string="Calls",
+    )
+    peak_memory = fields.Integer(
+        string="Peak Memory (KiB)",
+        help="Highest memory allocated inside the stage, only measured while tracemalloc is tracing",
+    )
@@ -0,0 +1,98 @@
+from odoo import fields, models
+
+
+class AccountMoveChangeJournalSnapshot(models.Model):
+    _name = "account.move.change.journal.snapshot"
+    _description = "Journal Change Snapshot"
+    _order = "run_id, id"
+
+    run_id = fields.Many2one(
+        "account.move.change.journal.run",
+        string="Run",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    record_type = fields.Selection(
+        [
+            ("move", "Move"),
+            ("payment", "Payment"),
+        ],
+        string="Record Type",
+        required=True,
+    )
+    move_id = fields.Many2one(
+        "account.move",
+        string="Move",
+        ondelete="cascade",
+    )
+    payment_id = fields.Many2one(
+        "account.payment",
+        string="Payment",
+        ondelete="cascade",
+    )
+    old_journal_id = fields.Many2one(
+        "account.journal",
+        string="Old Journal",
+    )
+    new_journal_id = fields.Many2one(
+        "account.journal",
+        string="New Journal",
+    )
+    old_name = fields.Char(
+        string="Old Number",
+    )
+    old_sequence_prefix = fields.Char(
+        string="Old Sequence Prefix",
+    )
+    old_sequence_number = fields.Integer(
+        string="Old Sequence Number",
+    )
+    old_payment_method_line_id = fields.Many2one(
+        "account.payment.method.line",
+        string="Old Payment Method",
+    )
+    # Plain integer, the receiptbook model comes from an optional module
+    old_receiptbook_id = fields.Integer(
+        string="Old Receiptbook",
+    )
+
+
+class AccountMoveChangeJournalSnapshotPartial(models.Model):
+    _name = "account.move.change.journal.snapshot.partial"
+    _description = "Journal Change Snapshot Partial Reconcile"
+    _order = "run_id, id"
+
+    run_id = fields.Many2one(
+        "account.move.change.journal.run",
+        string="Run",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    debit_move_id = fields.Many2one(
+        "account.move.line",
+        string="Debit Line",
+        ondelete="cascade",
+    )
+    credit_move_id = fields.Many2one(
+        "account.move.line",
+        string="Credit Line",
+        ondelete="cascade",
+    )
+    amount = fields.Float(
+        string="Amount",
+        digits=0,
+    )
+    debit_amount_currency = fields.Float(
+        string="Debit Amount in Currency",
+        digits=0,
+    )
+    credit_amount_currency = fields.Float(
+        string="Credit Amount in Currency",
+        digits=0,
+    )
+    # Id of the removed full reconcile, only used to group the partials back
+    full_reconcile_ref = fields.Integer(
+        string="Full Reconcile Reference",
+    )
@@ -0,0 +1,28 @@
+from odoo import api, models
+
+# Payment method line fields the journal change compatibility index depends on
+CHANGE_JOURNAL_COMPATIBILITY_FIELDS = {
+    "journal_id",
+    "payment_method_id",
+    "payment_account_id",
+}
+
+
+class AccountPaymentMethodLine(models.Model):
+    _inherit = "account.payment.method.line"
+
+    # Clear the journal change compatibility index, see account.journal
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if CHANGE_JOURNAL_COMPATIBILITY_FIELDS.intersection(vals):
+            self.env.registry.clear_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env.registry.clear_cache()
+        return super().unlink()
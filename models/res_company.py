@@ -0,0 +1,17 @@
+from odoo import models
+
+# Company fields the journal change compatibility index depends on
+CHANGE_JOURNAL_COMPATIBILITY_FIELDS = {
+    "account_journal_payment_debit_account_id",
+    "account_journal_payment_credit_account_id",
+    "use_receiptbook",
+}
+
+
+class ResCompany(models.Model):
+    _inherit = "res.company"
+
+    def write(self, vals):
+        if CHANGE_JOURNAL_COMPATIBILITY_FIELDS.intersection(vals):
+            self.env.registry.clear_cache()
+        return super().write(vals)
@@ -0,0 +1,4 @@
+from . import test_account_move_change_journal
+from . import test_account_move_change_journal_job
+from . import test_account_move_change_journal_rule
+from . import test_change_journal_benchmark
@@ -0,0 +1,49 @@
+from odoo import Command, fields
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+class ChangeJournalCommon(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        company = cls.company_data["company"]
+        cls.source_journal, cls.target_journal = cls.env["account.journal"].create([
+            {"name": "Source Bank", "code": "SBNK", "type": "bank", "company_id": company.id},
+            {"name": "Target Bank", "code": "TBNK", "type": "bank", "company_id": company.id},
+        ])
+
+    @classmethod
+    def _create_paid_invoices(cls, count, journal, move_type="out_invoice", invoice_date="2024-01-15"):
+        """Create ``count`` posted invoices paid with a payment in ``journal``
+
+        Returns the payments.
+        """
+        invoices = cls.env["account.move"].create([{
+            "move_type": move_type,
+            "partner_id": cls.partner_a.id,
+            "invoice_date": invoice_date,
+            "invoice_line_ids": [Command.create({
+                "name": f"Line {index}",
+                "quantity": 1,
+                "price_unit": 100.0 + index,
+                "tax_ids": [Command.clear()],
+            })],
+        } for index in range(count)])
+        invoices.action_post()
+        return cls.env["account.payment.register"].with_context(
+            active_model="account.move",
+            active_ids=invoices.ids,
+        ).create({
+            "journal_id": journal.id,
+            "payment_date": fields.Date.to_date(invoice_date),
+            "group_payment": False,
+        })._create_payments()
+
+    def _create_wizard(self, moves, **values):
+        """Open the wizard on ``moves`` as from their list view"""
+        return moves.env["account.move.change.journal"].with_context(
+            active_model="account.move",
+            active_ids=moves.ids,
+        ).create(values)
@@ -0,0 +1,350 @@
+from psycopg2.errors import LockNotAvailable, SerializationFailure
+
+from odoo import Command
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from .common import ChangeJournalCommon
+
+
+@tagged("post_install", "-at_install")
+class TestAccountMoveChangeJournal(ChangeJournalCommon):
+
+    def _create_bank_journal(self, name, code):
+        return self.env["account.journal"].create({
+            "name": name,
+            "code": code,
+            "type": "bank",
+            "company_id": self.company_data["company"].id,
+        })
+
+    def _assert_changed(self, payments, journal):
+        for payment in payments:
+            self.assertEqual(payment.journal_id, journal)
+            self.assertEqual(payment.move_id.journal_id, journal)
+            self.assertEqual(payment.move_id.line_ids.journal_id, journal)
+            self.assertEqual(payment.payment_method_line_id.journal_id, journal)
+
+    def test_change_payment_journal(self):
+        payments = self._create_paid_invoices(2, self.source_journal)
+        invoices = payments.reconciled_invoice_ids
+        wizard = self._create_wizard(
+            payments.move_id, journal_to_id=self.target_journal.id, audit_mode="log",
+        )
+        wizard.action_change_journal()
+
+        self._assert_changed(payments, self.target_journal)
+        self.assertEqual(set(invoices.mapped("payment_state")), {"not_paid"})
+        logs = self.env["account.move.change.journal.log"].search([("batch_ref", "=", wizard.batch_ref)])
+        self.assertEqual(len(logs), 4)
+        self.assertEqual(set(logs.mapped("old_journal_id")), {self.source_journal})
+
+    def test_bulk_mode(self):
+        payments = self._create_paid_invoices(3, self.source_journal)
+        wizard = self._create_wizard(
+            payments.move_id, journal_to_id=self.target_journal.id, bulk_mode=True, reset_sequence=True,
+        )
+        wizard.action_change_journal()
+
+        self._assert_changed(payments, self.target_journal)
+        names = payments.move_id.mapped("name")
+        self.assertTrue(all(self.target_journal.code in name for name in names))
+        self.assertEqual(len(set(names)), 3)
+
+    def test_bulk_renumbering_follows_dates_across_source_journals(self):
+        other_journal = self._create_bank_journal("Other Bank", "OBNK")
+        late = self._create_paid_invoices(2, self.source_journal, invoice_date="2024-01-20")
+        early = self._create_paid_invoices(1, other_journal, invoice_date="2024-01-05")
+        wizard = self._create_wizard(
+            (late | early).move_id, journal_to_id=self.target_journal.id, bulk_mode=True, reset_sequence=True,
+        )
+        wizard.action_change_journal()
+
+        self.assertLess(
+            early.move_id.sequence_number,
+            min(late.move_id.mapped("sequence_number")),
+        )
+
+    def test_bulk_renumbering_per_sequence_period(self):
+        previous_year = self._create_paid_invoices(1, self.source_journal, invoice_date="2023-12-28")
+        current_year = self._create_paid_invoices(2, self.source_journal, invoice_date="2024-01-05")
+        wizard = self._create_wizard(
+            (previous_year | current_year).move_id,
+            journal_to_id=self.target_journal.id, bulk_mode=True, reset_sequence=True,
+        )
+        wizard.action_change_journal()
+
+        self.assertEqual(previous_year.move_id.sequence_prefix, "TBNK/2023/")
+        self.assertEqual(previous_year.move_id.sequence_number, 1)
+        self.assertEqual(set(current_year.move_id.mapped("sequence_prefix")), {"TBNK/2024/"})
+        self.assertEqual(sorted(current_year.move_id.mapped("sequence_number")), [1, 2])
+
+    def test_dry_run_preview_keeps_moves(self):
+        payments = self._create_paid_invoices(2, self.source_journal)
+        names = payments.move_id.mapped("name")
+        wizard = self._create_wizard(payments.move_id, journal_to_id=self.target_journal.id)
+        wizard.action_preview_change()
+
+        self.assertEqual(payments.journal_id, self.source_journal)
+        self.assertEqual(payments.move_id.mapped("name"), names)
+        self.assertFalse(self.env["account.move.change.journal.run"].search([("batch_ref", "=", wizard.batch_ref)]))
+
+    def test_preview_matches_execution(self):
+        for bulk_mode in (False, True):
+            with self.subTest(bulk_mode=bulk_mode):
+                late = self._create_paid_invoices(1, self.source_journal, invoice_date="2024-01-20")
+                early = self._create_paid_invoices(1, self.source_journal, invoice_date="2024-01-05")
+                moves = late.move_id | early.move_id
+                wizard = self._create_wizard(
+                    moves, journal_to_id=self.target_journal.id, bulk_mode=bulk_mode, reset_sequence=True,
+                )
+                rows = wizard._get_preview_rows(wizard._get_moves_to_change())
+                self.assertEqual(moves.journal_id, self.source_journal)
+
+                wizard.action_change_journal()
+
+                preview = {(row[0], row[1]): (row[4], row[6]) for row in rows}
+                records = [("move", move) for move in moves] + [("payment", payment) for payment in late | early]
+                self.assertEqual(len(preview), len(records))
+                for record_type, record in records:
+                    self.assertEqual(
+                        preview[record_type, record.id],
+                        (record.journal_id.display_name, record.name),
+                    )
+
+    def test_revert(self):
+        payments = self._create_paid_invoices(2, self.source_journal)
+        invoices = payments.reconciled_invoice_ids
+        names = payments.move_id.mapped("name")
+        methods = payments.payment_method_line_id
+        wizard = self._create_wizard(
+            payments.move_id, journal_to_id=self.target_journal.id, bulk_mode=True, reset_sequence=True,
+        )
+        wizard.action_change_journal()
+        run = self.env["account.move.change.journal.run"].search([("batch_ref", "=", wizard.batch_ref)])
+
+        run.action_revert()
+
+        self.assertEqual(run.state, "reverted")
+        self.assertEqual(payments.journal_id, self.source_journal)
+        self.assertEqual(payments.move_id.journal_id, self.source_journal)
+        self.assertEqual(payments.move_id.mapped("name"), names)
+        self.assertEqual(payments.payment_method_line_id, methods)
+        self.assertTrue(set(invoices.mapped("payment_state")) <= {"paid", "in_payment"})
+        with self.assertRaises(UserError):
+            run.action_revert()
+
+    def test_errors_roll_back_everything(self):
+        inbound = self._create_paid_invoices(1, self.source_journal)
+        outbound = self._create_paid_invoices(1, self.source_journal, move_type="in_invoice")
+        self.target_journal.outbound_payment_method_line_ids = [Command.clear()]
+        wizard = self._create_wizard(
+            (inbound | outbound).move_id, journal_to_id=self.target_journal.id, force_change=True,
+        )
+        with self.assertRaises(UserError):
+            wizard.action_change_journal()
+
+        self.assertEqual((inbound | outbound).journal_id, self.source_journal)
+        self.assertEqual((inbound | outbound).move_id.journal_id, self.source_journal)
+
+    def test_isolate_failures(self):
+        inbound = self._create_paid_invoices(2, self.source_journal)
+        outbound = self._create_paid_invoices(1, self.source_journal, move_type="in_invoice")
+        self.target_journal.outbound_payment_method_line_ids = [Command.clear()]
+        wizard = self._create_wizard(
+            (inbound | outbound).move_id,
+            journal_to_id=self.target_journal.id,
+            force_change=True,
+            bulk_mode=True,
+            isolate_failures=True,
+            chunk_size=2,
+        )
+        result = wizard._process_change(wizard._get_moves_to_change())
+
+        self._assert_changed(inbound, self.target_journal)
+        self.assertEqual(outbound.journal_id, self.source_journal)
+        self.assertEqual(outbound.move_id.journal_id, self.source_journal)
+        self.assertEqual([failure["move_id"] for failure in result["failures"]], outbound.move_id.ids)
+        self.assertTrue(result["failures"][0]["reasons"])
+
+    def test_lock_records_skips_locked_moves(self):
+        payments = self._create_paid_invoices(3, self.source_journal)
+        locked = payments[0].move_id
+        Wizard = type(self.env["account.move.change.journal"])
+        lock_rows = Wizard._lock_rows
+
+        def _lock_rows(wizard, moves):
+            # Another transaction holds the lock of the first move
+            if len(moves) > 1:
+                raise SerializationFailure()
+            if moves == locked:
+                raise LockNotAvailable()
+            return lock_rows(wizard, moves)
+
+        self.patch(Wizard, "_lock_rows", _lock_rows)
+        wizard = self._create_wizard(
+            payments.move_id, journal_to_id=self.target_journal.id, bulk_mode=True, lock_records=True,
+        )
+        result = wizard._process_change(wizard._get_moves_to_change())
+
+        self.assertEqual(result["skipped_moves"], locked)
+        self.assertEqual(payments[0].journal_id, self.source_journal)
+        self.assertEqual(locked.journal_id, self.source_journal)
+        self._assert_changed(payments[1:], self.target_journal)
+
+    def test_lock_records_skips_partition_on_serialization_failure(self):
+        other_source = self._create_bank_journal("Other Bank", "OBNK")
+        payments = self._create_paid_invoices(2, self.source_journal)
+        other_payments = self._create_paid_invoices(1, other_source)
+        Wizard = type(self.env["account.move.change.journal"])
+        apply_change = Wizard._apply_change
+
+        def _apply_change(wizard, moves, unreconcile_stats, resolver):
+            result = apply_change(wizard, moves, unreconcile_stats, resolver)
+            if moves.journal_id == other_source:
+                raise SerializationFailure()
+            return result
+
+        self.patch(Wizard, "_apply_change", _apply_change)
+        wizard = self._create_wizard(
+            (payments | other_payments).move_id,
+            journal_to_id=self.target_journal.id, bulk_mode=True, lock_records=True, audit_mode="log",
+        )
+        result = wizard._process_change(wizard._get_moves_to_change())
+
+        self.assertEqual(result["skipped_moves"], other_payments.move_id)
+        self.assertEqual(other_payments.journal_id, other_source)
+        self.assertEqual(other_payments.move_id.journal_id, other_source)
+        self._assert_changed(payments, self.target_journal)
+        self.assertEqual(result["run"].snapshot_count, 4)
+
+    def test_background_partitions_per_source_and_target(self):
+        other_source = self._create_bank_journal("Other Bank", "OBNK")
+        payments = self._create_paid_invoices(1, self.source_journal)
+        other_payments = self._create_paid_invoices(1, other_source)
+        wizard = self._create_wizard(
+            (payments | other_payments).move_id,
+            journal_to_id=self.target_journal.id, lock_records=True, reset_sequence=True,
+        )
+        action = wizard.action_change_journal_background()
+
+        jobs = self.env["account.move.change.journal.job"].search(action["domain"])
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual(jobs.journal_to_id, self.target_journal)
+        self.assertEqual(
+            {job.chunk_ids.move_ids.journal_id for job in jobs},
+            {self.source_journal, other_source},
+        )
+
+    def test_mapping_mode(self):
+        other_source = self._create_bank_journal("Other Bank", "OBNK")
+        other_target = self._create_bank_journal("Other Target", "OTGT")
+        payments = self._create_paid_invoices(1, self.source_journal)
+        other_payments = self._create_paid_invoices(1, other_source)
+        wizard = self._create_wizard((payments | other_payments).move_id, target_mode="mapping", bulk_mode=True)
+        self.assertEqual(wizard.mapping_ids.journal_from_id, self.source_journal | other_source)
+        for line in wizard.mapping_ids:
+            line.journal_to_id = self.target_journal if line.journal_from_id == self.source_journal else other_target
+
+        wizard.action_change_journal()
+
+        self._assert_changed(payments, self.target_journal)
+        self._assert_changed(other_payments, other_target)
+        runs = self.env["account.move.change.journal.run"].search([("batch_ref", "=", wizard.batch_ref)])
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs.journal_to_ids, self.target_journal | other_target)
+        self.assertFalse(wizard.journal_to_id)
+
+    def test_api_change_journal(self):
+        payments = self._create_paid_invoices(2, self.source_journal)
+        result = self.env["account.move.change.journal"].api_change_journal(
+            self.target_journal.id, move_ids=payments.move_id.ids, options={"audit_mode": "log"},
+        )
+
+        self._assert_changed(payments, self.target_journal)
+        self.assertEqual({move["status"] for move in result["moves"]}, {"changed"})
+        self.assertEqual(sorted(move["id"] for move in result["moves"]), sorted(payments.move_id.ids))
+        self.assertEqual(sorted(result["changed_payment_ids"]), sorted(payments.ids))
+        self.assertTrue(result["run_ids"])
+        with self.assertRaises(UserError):
+            self.env["account.move.change.journal"].api_change_journal(
+                self.target_journal.id, move_ids=payments.move_id.ids, options={"unknown": True},
+            )
+
+    def test_api_change_journal_without_isolation_raises(self):
+        inbound = self._create_paid_invoices(1, self.source_journal)
+        outbound = self._create_paid_invoices(1, self.source_journal, move_type="in_invoice")
+        self.target_journal.outbound_payment_method_line_ids = [Command.clear()]
+        with self.assertRaises(UserError):
+            self.env["account.move.change.journal"].api_change_journal(
+                self.target_journal.id,
+                move_ids=(inbound | outbound).move_id.ids,
+                options={"force_change": True, "isolate_failures": False},
+            )
+
+        self.assertEqual((inbound | outbound).move_id.journal_id, self.source_journal)
+
+    def test_selection_mode(self):
+        payments = self._create_paid_invoices(2, self.source_journal)
+        Wizard = self.env["account.move.change.journal"]
+        wizard = Wizard.with_context(
+            active_model="account.move",
+            active_ids=payments.move_id.ids,
+            active_domain=[("journal_id", "=", self.source_journal.id)],
+        ).create({"journal_to_id": self.target_journal.id})
+        self.assertEqual(wizard.selection_mode, "ids")
+
+        wizard = Wizard.with_context(
+            active_model="account.move",
+            active_ids=[],
+            active_domain=[],
+        ).create({"journal_to_id": self.target_journal.id})
+        self.assertEqual(wizard.selection_mode, "ids")
+        self.assertFalse(wizard.move_ids)
+
+        wizard = Wizard.with_context(
+            active_model="account.move",
+            active_ids=payments.move_id.ids,
+            active_domain=[("id", "in", payments.move_id.ids)],
+            change_journal_domain_selection=True,
+        ).create({"journal_to_id": self.target_journal.id})
+        self.assertEqual(wizard.selection_mode, "domain")
+        self.assertEqual(wizard.move_count, 2)
+
+    def test_domain_selection_batches_share_one_run(self):
+        payments = self._create_paid_invoices(3, self.source_journal)
+        wizard = self.env["account.move.change.journal"].with_context(
+            active_model="account.move",
+            active_ids=payments.move_id.ids,
+            active_domain=[("id", "in", payments.move_id.ids)],
+            change_journal_domain_selection=True,
+        ).create({
+            "journal_to_id": self.target_journal.id,
+            "bulk_mode": True,
+            "chunk_size": 1,
+            "audit_summary": True,
+        })
+        wizard.action_change_journal()
+
+        self._assert_changed(payments, self.target_journal)
+        run = self.env["account.move.change.journal.run"].search([("batch_ref", "=", wizard.batch_ref)])
+        self.assertEqual(len(run), 1)
+        self.assertEqual(run.changed_move_count, 3)
+        self.assertEqual(run.changed_payment_count, 3)
+        self.assertEqual(run.snapshot_count, 6)
+        self.assertEqual(len(run.stage_ids), len(set(run.stage_ids.mapped("name"))))
+        summaries = self.target_journal.message_ids.filtered(lambda m: wizard.batch_ref in (m.body or ""))
+        self.assertEqual(len(summaries), 1)
+
+        run.action_revert()
+        self.assertEqual(payments.move_id.journal_id, self.source_journal)
+
+    def test_available_journals(self):
+        payments = self._create_paid_invoices(1, self.source_journal)
+        wizard = self._create_wizard(payments.move_id)
+        self.assertIn(self.target_journal, wizard.available_journal_ids)
+        self.assertNotIn(self.company_data["default_journal_sale"], wizard.available_journal_ids)
+
+        self.target_journal.inbound_payment_method_line_ids = [Command.clear()]
+        wizard = self._create_wizard(payments.move_id)
+        self.assertNotIn(self.target_journal, wizard.available_journal_ids)
@@ -0,0 +1,105 @@
+from odoo import Command
+from odoo.exceptions import AccessError
+from odoo.tests import tagged
+
+from .common import ChangeJournalCommon
+
+
+@tagged("post_install", "-at_install")
+class TestAccountMoveChangeJournalJob(ChangeJournalCommon):
+
+    def setUp(self):
+        super().setUp()
+        # The workers commit after each chunk
+        self.patch(self.env.cr, "commit", lambda: None)
+
+    def _create_job(self, moves, **values):
+        wizard = self._create_wizard(moves, journal_to_id=self.target_journal.id, **values)
+        action = wizard.action_change_journal_background()
+        return self.env["account.move.change.journal.job"].browse(action["res_id"])
+
+    def test_job_processes_chunks_in_one_run(self):
+        payments = self._create_paid_invoices(3, self.source_journal)
+        job = self._create_job(payments.move_id, bulk_mode=True, chunk_size=1)
+        self.assertEqual(len(job.chunk_ids), 3)
+        self.assertEqual(job.state, "queued")
+
+        job._cron_process_jobs()
+
+        self.assertEqual(job.state, "done")
+        self.assertEqual(set(job.chunk_ids.mapped("state")), {"done"})
+        self.assertEqual(payments.move_id.journal_id, self.target_journal)
+        self.assertEqual(job.changed_move_count, 3)
+        runs = self.env["account.move.change.journal.run"].search([("batch_ref", "=", job.batch_ref)])
+        self.assertEqual(runs, job.run_id)
+        self.assertEqual(runs.changed_move_count, 3)
+
+    def test_job_resumes_after_crash(self):
+        payments = self._create_paid_invoices(3, self.source_journal)
+        job = self._create_job(payments.move_id, bulk_mode=True, chunk_size=1)
+        # The worker crashed after committing the first chunk
+        first_chunk = job.chunk_ids.sorted("sequence")[0]
+        job.state = "running"
+        first_chunk.state = "done"
+
+        job._cron_process_jobs()
+
+        self.assertEqual(job.state, "done")
+        self.assertEqual(first_chunk.move_ids.journal_id, self.source_journal)
+        self.assertEqual((payments.move_id - first_chunk.move_ids).journal_id, self.target_journal)
+
+    def test_job_cancel(self):
+        payments = self._create_paid_invoices(2, self.source_journal)
+        job = self._create_job(payments.move_id, bulk_mode=True, chunk_size=1)
+        job.action_cancel()
+
+        job._cron_process_jobs()
+
+        self.assertEqual(job.state, "cancel")
+        self.assertEqual(payments.move_id.journal_id, self.source_journal)
+        self.assertEqual(set(job.chunk_ids.mapped("state")), {"pending"})
+
+    def test_failing_chunk_is_rolled_back(self):
+        inbound = self._create_paid_invoices(1, self.source_journal)
+        outbound = self._create_paid_invoices(1, self.source_journal, move_type="in_invoice")
+        self.target_journal.outbound_payment_method_line_ids = [Command.clear()]
+        job = self._create_job((inbound | outbound).move_id, force_change=True, chunk_size=2)
+
+        job._cron_process_jobs()
+
+        self.assertEqual(job.state, "failed")
+        self.assertEqual(job.chunk_ids.state, "failed")
+        self.assertTrue(job.chunk_ids.error_message)
+        self.assertEqual((inbound | outbound).journal_id, self.source_journal)
+        self.assertEqual((inbound | outbound).move_id.journal_id, self.source_journal)
+
+    def test_users_only_read_and_cancel_their_jobs(self):
+        company = self.company_data["company"]
+        user = self.env["res.users"].create({
+            "name": "Accountant",
+            "login": "change_journal_accountant",
+            "company_id": company.id,
+            "company_ids": [Command.set(company.ids)],
+            "groups_id": [Command.set(self.env.ref("account.group_account_user").ids)],
+        })
+        payments = self._create_paid_invoices(1, self.source_journal)
+        wizard = self._create_wizard(
+            payments.move_id.with_user(user), journal_to_id=self.target_journal.id,
+        )
+        action = wizard.action_change_journal_background()
+        job = self.env["account.move.change.journal.job"].with_user(user).browse(action["res_id"])
+        self.assertEqual(job.create_uid, user)
+
+        with self.assertRaises(AccessError):
+            job.write({"force_change": True})
+        with self.assertRaises(AccessError):
+            job.chunk_ids.write({"move_ids": [Command.clear()]})
+        with self.assertRaises(AccessError):
+            self.env["account.move.change.journal.job"].with_user(user).create({
+                "name": "Forged",
+                "company_id": company.id,
+                "journal_to_id": self.target_journal.id,
+            })
+
+        job.action_cancel()
+        self.assertEqual(job.state, "cancel")
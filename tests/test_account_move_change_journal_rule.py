@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from odoo import Command
+from odoo.tests import tagged
+from odoo.tools import SQL
+
+from .common import ChangeJournalCommon
+
+
+@tagged("post_install", "-at_install")
+class TestAccountMoveChangeJournalRule(ChangeJournalCommon):
+
+    def setUp(self):
+        super().setUp()
+        # Rules commit after each batch
+        self.patch(self.env.cr, "commit", lambda: None)
+
+    def _create_rule(self, **values):
+        return self.env["account.move.change.journal.rule"].create({
+            "name": "Source to target",
+            "move_domain": repr([("journal_id", "=", self.source_journal.id)]),
+            "journal_to_id": self.target_journal.id,
+            "force_change": True,
+            **values,
+        })
+
+    def _set_write_date(self, moves, write_date):
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "UPDATE account_move SET write_date = %s WHERE id = ANY(%s)", write_date, moves.ids,
+        ))
+        self.env.invalidate_all()
+
+    def test_rule_applies_in_batches(self):
+        payments = self._create_paid_invoices(3, self.source_journal)
+        rule = self._create_rule(batch_size=1)
+
+        rule._apply()
+
+        self.assertEqual(payments.move_id.journal_id, self.target_journal)
+        self.assertEqual(rule.last_move_id, max(payments.move_id.ids))
+        self.assertTrue(rule.last_write_date)
+        self.assertEqual(rule.last_run_move_count, 3)
+        self.assertFalse(rule.last_run_error)
+        runs = self.env["account.move.change.journal.run"].search([("company_id", "=", rule.company_id.id)])
+        self.assertEqual(len(runs), 1)
+        logs = self.env["account.move.change.journal.log"].search([("move_id", "in", payments.move_id.ids)])
+        self.assertEqual(set(logs.mapped("batch_ref")), {runs.batch_ref})
+        self.assertEqual(runs.changed_move_count, 3)
+
+    def test_rule_rescans_overlap_margin(self):
+        rule = self._create_rule()
+        self._create_paid_invoices(1, self.source_journal)
+        rule._apply()
+        mark = rule.last_write_date
+
+        # Committed by long transactions after the previous run
+        within_margin = self._create_paid_invoices(1, self.source_journal)
+        before_margin = self._create_paid_invoices(1, self.source_journal)
+        self._set_write_date(within_margin.move_id, mark - timedelta(minutes=5))
+        self._set_write_date(before_margin.move_id, mark - timedelta(minutes=20))
+
+        rule._apply()
+
+        self.assertEqual(within_margin.move_id.journal_id, self.target_journal)
+        self.assertEqual(before_margin.move_id.journal_id, self.source_journal)
+        self.assertEqual(rule.last_write_date, mark)
+
+    def test_rule_retries_failed_moves(self):
+        inbound = self._create_paid_invoices(1, self.source_journal)
+        outbound = self._create_paid_invoices(1, self.source_journal, move_type="in_invoice")
+        outbound_lines = self.target_journal.outbound_payment_method_line_ids
+        self.target_journal.outbound_payment_method_line_ids = [Command.clear()]
+        rule = self._create_rule()
+
+        rule._apply()
+
+        self.assertEqual(inbound.move_id.journal_id, self.target_journal)
+        self.assertEqual(outbound.move_id.journal_id, self.source_journal)
+        self.assertEqual(rule.failed_move_ids, outbound.move_id)
+        self.assertTrue(rule.last_run_error)
+
+        self.target_journal.outbound_payment_method_line_ids = [
+            Command.create({"payment_method_id": line.payment_method_id.id}) for line in outbound_lines
+        ]
+        rule._apply()
+
+        self.assertEqual(outbound.move_id.journal_id, self.target_journal)
+        self.assertFalse(rule.failed_move_ids)
+        self.assertFalse(rule.last_run_error)
+
+    def test_failing_rule_does_not_stop_the_others(self):
+        payments = self._create_paid_invoices(1, self.source_journal)
+        failing = self._create_rule(name="Failing", sequence=1)
+        rule = self._create_rule(sequence=2)
+        Rule = type(self.env["account.move.change.journal.rule"])
+        apply = Rule._apply
+
+        def _apply(rule):
+            if rule == failing:
+                raise ValueError("Unexpected error")
+            return apply(rule)
+
+        self.patch(Rule, "_apply", _apply)
+        self.patch(self.env.cr, "rollback", lambda: None)
+
+        with self.assertLogs("odoo.addons.account_move_change_journal.models.account_move_change_journal_rule", "ERROR"):
+            self.env["account.move.change.journal.rule"]._cron_apply_rules()
+
+        self.assertIn("Unexpected error", failing.last_run_error)
+        self.assertEqual(rule.last_run_move_count, 1)
+        self.assertEqual(payments.move_id.journal_id, self.target_journal)
@@ -0,0 +1,94 @@
+import logging
+import os
+import tracemalloc
+
+from odoo.tests import tagged
+
+from .common import ChangeJournalCommon
+
+_logger = logging.getLogger(__name__)
+
+# Queries per changed move allowed to the whole execution (lock, resolve,
+# unreconcile, payment update, move write, renumber and audit)
+QUERY_BUDGET_PER_MOVE = 5
+
+# Number of paid invoices changed per benchmark, comma separated, e.g.
+# CHANGE_JOURNAL_BENCHMARK_SIZES=1000,10000,100000
+BENCHMARK_SIZES = [
+    int(size) for size in os.environ.get("CHANGE_JOURNAL_BENCHMARK_SIZES", "100").split(",") if size.strip()
+]
+
+
+@tagged("post_install", "-at_install", "change_journal_benchmark")
+class TestChangeJournalBenchmark(ChangeJournalCommon):
+    """Query budget, wall time and peak memory per stage of the journal change
+
+    Run with --test-tags change_journal_benchmark, the sizes are read from
+    the CHANGE_JOURNAL_BENCHMARK_SIZES environment variable.
+    """
+
+    def _run_change(self, size, **values):
+        payments = self._create_paid_invoices(size, self.source_journal)
+        self.env.flush_all()
+        self.env.invalidate_all()
+        wizard = self._create_wizard(payments.move_id, journal_to_id=self.target_journal.id, **values)
+        tracemalloc.start()
+        try:
+            wizard.action_change_journal()
+        finally:
+            tracemalloc.stop()
+        run = self.env["account.move.change.journal.run"].search(
+            [("batch_ref", "=", wizard.batch_ref)]
+        )
+        self.assertEqual(run.changed_move_count, size)
+        self.assertEqual(run.changed_payment_count, size)
+        self._report(run, size)
+        return run
+
+    def _report(self, run, size):
+        _logger.info(
+            "Benchmark %s, %s moves: %.3fs, %s queries",
+            self._testMethodName, size, run.duration, run.query_count,
+        )
+        for stage in run.stage_ids:
+            _logger.info(
+                "Benchmark %s, %s moves: stage %s: %.3fs, %s queries, %s rows, peak memory %s KiB",
+                self._testMethodName, size, stage.name, stage.duration, stage.query_count,
+                stage.row_count, stage.peak_memory,
+            )
+
+    def _assert_budget(self, run, size):
+        self.assertLessEqual(
+            run.query_count / size, QUERY_BUDGET_PER_MOVE,
+            "%s queries for %s moves, stages: %s" % (
+                run.query_count, size,
+                {stage.name: stage.query_count for stage in run.stage_ids},
+            ),
+        )
+
+    def test_bulk_mode_query_budget(self):
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size):
+                run = self._run_change(size, bulk_mode=True, reset_sequence=True, audit_mode="log")
+                self._assert_budget(run, size)
+
+    def test_bulk_mode_with_lock_query_budget(self):
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size):
+                run = self._run_change(
+                    size, bulk_mode=True, reset_sequence=True, audit_mode="log", lock_records=True,
+                )
+                self._assert_budget(run, size)
+
+    def test_bulk_mode_measures_peak_memory(self):
+        run = self._run_change(20, bulk_mode=True, audit_mode="log")
+        self.assertTrue(any(stage.peak_memory for stage in run.stage_ids))
+
+    def test_bulk_mode_query_count_does_not_grow_per_group(self):
+        """The number of resolve, unreconcile, update and audit queries does not depend on the size"""
+        small = self._run_change(20, bulk_mode=True, audit_mode="log")
+        large = self._run_change(80, bulk_mode=True, audit_mode="log")
+        small_stages = {stage.name: stage.query_count for stage in small.stage_ids}
+        large_stages = {stage.name: stage.query_count for stage in large.stage_ids}
+        for name in ("resolve", "unreconcile", "payment_update", "audit"):
+            self.assertEqual(large_stages.get(name), small_stages.get(name), name)
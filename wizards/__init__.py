@@ -1 +1,2 @@
 from . import account_move_change_journal
+from . import account_move_change_journal_mapping
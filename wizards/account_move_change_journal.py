@@ -1,17 +1,119 @@
+import csv
+import io
+import logging
+import time
+import uuid
+from ast import literal_eval
+from collections import defaultdict
+from contextlib import nullcontext
+
+from psycopg2.errors import LockNotAvailable, SerializationFailure
+
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
+from odoo.fields import Command
+from odoo.tools import SQL
+
+from .change_journal_profiler import ChangeJournalProfiler
+from .change_journal_snapshot import ChangeJournalSnapshot
+from .payment_target_resolver import PaymentTargetResolver
+
+_logger = logging.getLogger(__name__)
+
+# Above this number of selected records, the wizard keeps the domain of the
+# selection instead of the list of ids
+DOMAIN_SELECTION_THRESHOLD = 1000
+
+# Wizard options accepted by api_change_journal()
+API_OPTIONS = {
+    "reset_sequence",
+    "force_change",
+    "audit_mode",
+    "audit_summary",
+    "lock_records",
+    "isolate_failures",
+    "chunk_size",
+}
+
+
+class _ChunkFailure(Exception):
+    """Roll back the savepoint of a chunk whose change reported errors"""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+class _DryRunRollback(Exception):
+    """Raised to roll back the savepoint of a preview"""
 
 
 class AccountMoveChangeJournal(models.TransientModel):
     _name = "account.move.change.journal"
     _description = "Change Journal of Account Move"
 
+    @api.model
+    def _use_domain_selection(self):
+        """Whether the selection of the context is kept as a domain rather than ids
+
+        The web client sends active_domain with every list action, so the
+        domain is only used when the whole domain was selected: the client
+        truncated the ids to its active_ids_limit, the ids cover every record
+        matching the domain, or the change_journal_domain_selection context
+        key asks for it. Without ids the selection is never a domain.
+        """
+        active_domain = self._context.get("active_domain")
+        active_ids = self._context.get("active_ids") or []
+        if active_domain is None or not active_ids:
+            return False
+        if self._context.get("change_journal_domain_selection"):
+            return True
+        if len(active_ids) < DOMAIN_SELECTION_THRESHOLD:
+            return False
+        active_ids_limit = int(
+            self.env["ir.config_parameter"].sudo().get_param("web.active_ids_limit", 20000)
+        )
+        if len(active_ids) >= active_ids_limit:
+            return True
+        return self.env["account.move"].search_count(
+            active_domain, limit=len(active_ids) + 1
+        ) == len(active_ids)
+
     @api.model
     def _get_moves(self):
         """Get the moves from context"""
+        if self._use_domain_selection():
+            return self.env["account.move"]
         move_ids = self._context.get("active_ids", [])
         return self.env["account.move"].browse(move_ids)
 
+    @api.model
+    def _get_selection_mode(self):
+        """Get the selection mode from context"""
+        return "domain" if self._use_domain_selection() else "ids"
+
+    @api.model
+    def _get_move_domain_from_context(self):
+        """Get the domain of the selection from context"""
+        if self._use_domain_selection():
+            return repr(self._context.get("active_domain"))
+        return False
+
+    selection_mode = fields.Selection(
+        [
+            ("ids", "Selected Records"),
+            ("domain", "All Records Matching the Filter"),
+        ],
+        string="Selection",
+        default=_get_selection_mode,
+        required=True,
+        readonly=True,
+    )
+    move_domain = fields.Char(
+        string="Moves Domain",
+        default=_get_move_domain_from_context,
+        readonly=True,
+    )
     move_ids = fields.Many2many(
         "account.move",
         string="Moves",
@@ -24,12 +126,36 @@ class AccountMoveChangeJournal(models.TransientModel):
         compute="_compute_journal_from",
         store=True,
     )
+    target_mode = fields.Selection(
+        [
+            ("single", "Single Journal"),
+            ("mapping", "Journal Mapping"),
+        ],
+        string="Target",
+        default="single",
+        required=True,
+        help="Single Journal: move all the selected moves to the same journal.\n"
+             "Journal Mapping: choose a target journal per source journal, all the "
+             "groups are changed in a single execution.",
+    )
     journal_to_id = fields.Many2one(
         "account.journal",
         string="New Journal",
-        required=True,
         help="Select the journal to which you want to move the transactions",
     )
+    mapping_ids = fields.One2many(
+        "account.move.change.journal.mapping",
+        "wizard_id",
+        string="Journal Mapping",
+        compute="_compute_mapping_ids",
+        store=True,
+        readonly=False,
+    )
+    available_journal_ids = fields.Many2many(
+        "account.journal",
+        compute="_compute_available_journal_ids",
+        help="Journals of the company compatible with the selected moves and their payments",
+    )
     force_change = fields.Boolean(
         string="Force Change",
         default=False,
@@ -54,127 +180,366 @@ class AccountMoveChangeJournal(models.TransientModel):
         compute="_compute_company_id",
         store=True,
     )
+    bulk_mode = fields.Boolean(
+        string="Bulk Mode",
+        default=False,
+        help="Group moves and payments and apply the change with set-based statements. "
+             "Recommended for large selections",
+    )
+    audit_mode = fields.Selection(
+        [
+            ("chatter", "Chatter Message per Record"),
+            ("log", "Change Log"),
+        ],
+        string="Audit Trail",
+        default="chatter",
+        required=True,
+        help="Chatter Message per Record: post a message on every changed move and payment.\n"
+             "Change Log: store one compact row per changed record in the journal change log",
+    )
+    audit_summary = fields.Boolean(
+        string="Summary Message",
+        default=False,
+        help="Post a single summary message of the change on the target journal",
+    )
+    batch_ref = fields.Char(
+        string="Batch Reference",
+        default=lambda self: uuid.uuid4().hex[:12],
+        readonly=True,
+    )
+    lock_records = fields.Boolean(
+        string="Lock Records",
+        default=False,
+        help="Lock the moves and payments before changing them and skip the ones "
+             "being modified by another transaction instead of failing",
+    )
+    chunk_size = fields.Integer(
+        string="Chunk Size",
+        default=500,
+        help="Number of moves processed and committed together when the change runs in background",
+    )
+    isolate_failures = fields.Boolean(
+        string="Keep Successful Changes",
+        default=False,
+        help="Run each chunk of moves in its own savepoint and split the failing chunks "
+             "down to the offending moves, keeping every successful change instead of "
+             "rolling back the whole batch",
+    )
 
-    @api.depends("move_ids")
+    @api.depends("move_ids", "move_domain")
     def _compute_move_count(self):
         for wizard in self:
-            wizard.move_count = len(wizard.move_ids)
+            if wizard.selection_mode == "domain":
+                wizard.move_count = self.env["account.move"].search_count(wizard._get_move_domain())
+            else:
+                wizard.move_count = len(wizard.move_ids)
+
+    def _get_selected_values(self, fname, limit=2):
+        """Distinct values of a many2one field over the selected moves, at most ``limit``"""
+        self.ensure_one()
+        if self.selection_mode == "domain":
+            groups = self.env["account.move"]._read_group(
+                self._get_move_domain(), groupby=[fname], limit=limit,
+            )
+            return self.env["account.move"][fname].union(*(group[0] for group in groups))
+        return self.move_ids.mapped(fname)
 
-    @api.depends("move_ids")
+    @api.depends("move_ids", "move_domain")
     def _compute_company_id(self):
         for wizard in self:
-            companies = wizard.move_ids.mapped("company_id")
+            companies = wizard._get_selected_values("company_id")
             if len(companies) == 1:
                 wizard.company_id = companies[0]
             else:
                 wizard.company_id = self.env.company
 
-    @api.depends("move_ids")
+    @api.depends("move_ids", "move_domain")
     def _compute_journal_from(self):
         for wizard in self:
-            journals = wizard.move_ids.mapped("journal_id")
+            journals = wizard._get_selected_values("journal_id")
             if len(journals) == 1:
                 wizard.journal_from_id = journals[0]
             else:
                 wizard.journal_from_id = False
 
-    def _get_related_payments(self):
+    @api.depends("move_ids", "move_domain", "company_id", "force_change")
+    def _compute_available_journal_ids(self):
+        for wizard in self:
+            index = self.env["account.journal"]._get_change_journal_compatibility(wizard.company_id.id)
+            journal_ids = list(index)
+            if wizard.move_count and not wizard.force_change:
+                stats = wizard._get_move_statistics()
+                journal_types = {journal_type for __, journal_type, __, __, __, __ in stats["move_groups"]}
+                payment_types = {payment_type for __, payment_type, __, __ in stats["payment_groups"]}
+                journal_ids = [
+                    journal_id
+                    for journal_id, values in index.items()
+                    if values["type"] in journal_types
+                    and all(values[payment_type] == "ok" for payment_type in payment_types)
+                ]
+            wizard.available_journal_ids = self.env["account.journal"].browse(journal_ids)
+
+    @api.depends("target_mode", "move_ids", "move_domain")
+    def _compute_mapping_ids(self):
+        for wizard in self:
+            commands = [Command.clear()]
+            if wizard.target_mode == "mapping":
+                commands += [
+                    Command.create({"journal_from_id": journal.id})
+                    for journal in wizard._get_selected_values("journal_id", limit=None)
+                ]
+            wizard.mapping_ids = commands
+
+    def _get_journal_mapping(self):
+        """Target journal of each source journal in mapping mode
+
+        Returns a dict {source journal: target journal}, without the source
+        journals left unmapped or mapped to themselves.
+        """
+        self.ensure_one()
+        return {
+            line.journal_from_id: line.journal_to_id
+            for line in self.mapping_ids
+            if line.journal_to_id and line.journal_to_id != line.journal_from_id
+        }
+
+    def _get_journal_to(self):
+        """Target journal of the change being executed
+
+        In mapping mode, _execute_mapping() passes the target of each group in
+        the context key change_journal_target_id.
+        """
+        self.ensure_one()
+        target_id = self.env.context.get("change_journal_target_id")
+        if target_id:
+            return self.env["account.journal"].browse(target_id)
+        return self.journal_to_id
+
+    def _get_target_journal(self, journal):
+        """Target journal of the moves of the given source journal"""
+        self.ensure_one()
+        if self.target_mode == "mapping":
+            return self._get_journal_mapping().get(journal, self.env["account.journal"])
+        return self.journal_to_id
+
+    def _get_target_journals(self):
+        """All the target journals of the change"""
+        self.ensure_one()
+        if self.target_mode == "mapping":
+            return self.env["account.journal"].union(*self._get_journal_mapping().values())
+        return self.journal_to_id
+
+    def _get_change_domain(self):
+        """Domain restricting the selected moves to the ones that change journal"""
+        self.ensure_one()
+        if self.target_mode == "mapping":
+            return [("journal_id", "in", [journal.id for journal in self._get_journal_mapping()])]
+        return [("journal_id", "!=", self.journal_to_id.id)]
+
+    def _get_move_domain(self):
+        """Domain of the selected moves, whatever the selection mode"""
+        self.ensure_one()
+        if self.selection_mode == "domain":
+            return literal_eval(self.move_domain or "[]")
+        return [("id", "in", self.move_ids._origin.ids)]
+
+    def _get_moves_to_change(self):
+        """Get all the selected moves not yet in the target journal"""
+        self.ensure_one()
+        if self.selection_mode == "domain":
+            return self.env["account.move"].search(
+                self._get_move_domain() + self._get_change_domain(), order="id"
+            )
+        return self.move_ids.filtered_domain(self._get_change_domain())
+
+    def _iter_moves_to_change(self, batch_size):
+        """Stream the selected moves not yet in the target journal in batches
+
+        Moves are paginated by id (keyset pagination), so only ``batch_size``
+        ids are loaded at a time and moves changed by a previous batch are
+        never read again.
+        """
+        self.ensure_one()
+        if self.selection_mode != "domain":
+            moves = self._get_moves_to_change()
+            for start in range(0, len(moves), batch_size):
+                yield moves[start:start + batch_size]
+            return
+
+        domain = self._get_move_domain() + self._get_change_domain()
+        last_id = 0
+        while True:
+            moves = self.env["account.move"].search(
+                domain + [("id", ">", last_id)], order="id", limit=batch_size
+            )
+            if not moves:
+                return
+            last_id = moves.ids[-1]
+            yield moves
+
+    def _get_related_payments(self, moves=None):
         """Get payments related to the selected moves"""
         self.ensure_one()
+        if moves is None:
+            moves = self.move_ids
         payments = self.env["account.payment"].search([
-            ("move_id", "in", self.move_ids.ids)
+            ("move_id", "in", moves.ids)
         ])
         return payments
 
-    @api.depends("move_ids", "journal_to_id", "force_change")
+    def _get_moves_query(self):
+        """SQL subquery returning the ids of the selected moves"""
+        self.ensure_one()
+        if self.selection_mode == "domain":
+            return self.env["account.move"]._search(self._get_move_domain()).subselect()
+        return SQL("SELECT unnest(%s::integer[])", self.move_ids._origin.ids)
+
+    def _get_move_statistics(self):
+        """Aggregate the selected moves with a fixed number of queries
+
+        Returns a dict with the moves grouped by (journal, journal type,
+        move type, state), the number of moves with reconciled lines and the
+        related payments grouped by (journal of their move, payment type).
+        """
+        self.ensure_one()
+        self.env["account.move"].flush_model(["journal_id", "move_type", "state"])
+        self.env["account.move.line"].flush_model(["move_id", "reconciled"])
+        self.env["account.payment"].flush_model(["move_id", "payment_type"])
+        self.env["account.journal"].flush_model(["type"])
+        moves_query = self._get_moves_query()
+
+        self.env.cr.execute(SQL("""
+            SELECT move.journal_id, journal.type, move.move_type, move.state,
+                   COUNT(*), MIN(move.id)
+              FROM account_move move
+              JOIN account_journal journal ON journal.id = move.journal_id
+             WHERE move.id IN (%s)
+          GROUP BY move.journal_id, journal.type, move.move_type, move.state
+        """, moves_query))
+        move_groups = self.env.cr.fetchall()
+
+        self.env.cr.execute(SQL("""
+            SELECT COUNT(DISTINCT line.move_id)
+              FROM account_move_line line
+             WHERE line.move_id IN (%s)
+               AND line.reconciled
+        """, moves_query))
+        reconciled_count = self.env.cr.fetchone()[0]
+
+        self.env.cr.execute(SQL("""
+            SELECT move.journal_id, payment.payment_type, COUNT(*), MIN(payment.id)
+              FROM account_payment payment
+              JOIN account_move move ON move.id = payment.move_id
+             WHERE payment.move_id IN (%s)
+          GROUP BY move.journal_id, payment.payment_type
+        """, moves_query))
+        payment_groups = self.env.cr.fetchall()
+
+        return {
+            "move_groups": move_groups,
+            "reconciled_count": reconciled_count,
+            "payment_groups": payment_groups,
+        }
+
+    def _get_payment_method_availability(self, journal, payment_type):
+        """Check whether the journal can receive payments of the given type
+
+        Returns one of 'ok', 'no_method' or 'no_account', read from the
+        compatibility index of the journal's company.
+        """
+        index = self.env["account.journal"]._get_change_journal_compatibility(journal.company_id.id)
+        return index[journal.id][payment_type] if journal.id in index else "no_method"
+
+    @api.depends(
+        "move_ids", "move_domain", "journal_to_id", "force_change",
+        "target_mode", "mapping_ids.journal_to_id",
+    )
     def _compute_warnings(self):
+        Journal = self.env["account.journal"]
         for wizard in self:
             warnings = []
 
-            if not wizard.move_ids:
+            if not wizard.move_count:
                 warnings.append("<li>No moves selected</li>")
 
-            if wizard.journal_to_id:
+            if wizard._get_target_journals() and wizard.move_count:
+                stats = wizard._get_move_statistics()
+                move_groups = stats["move_groups"]
+
                 # Check if moves are posted
-                posted_moves = wizard.move_ids.filtered(lambda m: m.state == "posted")
-                if posted_moves:
+                posted_count = sum(count for __, __, __, state, count, __ in move_groups if state == "posted")
+                if posted_count:
                     warnings.append(
-                        f"<li><b>Warning:</b> {len(posted_moves)} move(s) are posted. "
+                        f"<li><b>Warning:</b> {posted_count} move(s) are posted. "
                         "Changing the journal of posted moves may affect accounting integrity.</li>"
                     )
 
                 # Check for different journals
-                journals = wizard.move_ids.mapped("journal_id")
-                if len(journals) > 1:
+                journal_count = len({journal_id for journal_id, __, __, __, __, __ in move_groups})
+                if journal_count > 1:
                     warnings.append(
-                        f"<li><b>Info:</b> Selected moves come from {len(journals)} different journals.</li>"
+                        f"<li><b>Info:</b> Selected moves come from {journal_count} different journals.</li>"
                     )
 
                 # Check for reconciled moves
-                reconciled_moves = wizard.move_ids.filtered(
-                    lambda m: any(line.reconciled for line in m.line_ids)
-                )
-                if reconciled_moves:
+                if stats["reconciled_count"]:
                     warnings.append(
-                        f"<li><b>Warning:</b> {len(reconciled_moves)} move(s) have reconciled lines. "
+                        f"<li><b>Warning:</b> {stats['reconciled_count']} move(s) have reconciled lines. "
                         "This operation will not unreconcile them.</li>"
                     )
 
                 # Check for different move types
-                move_types = wizard.move_ids.mapped("move_type")
+                move_types = {move_type for __, __, move_type, __, __, __ in move_groups}
                 if len(move_types) > 1:
                     warnings.append(
                         f"<li><b>Info:</b> Selected moves have different types: "
-                        f"{', '.join(set(move_types))}.</li>"
+                        f"{', '.join(move_types)}.</li>"
                     )
 
                 # Check if target journal supports move types
-                for move in wizard.move_ids:
-                    if move.move_type and wizard.journal_to_id.type != move.journal_id.type:
-                        warnings.append(
-                            f"<li><b>Warning:</b> Move {move.name} has type '{move.move_type}' "
-                            f"but target journal type is '{wizard.journal_to_id.type}'. "
-                            "This may cause issues.</li>"
-                        )
-                        break
+                mismatches = {}
+                for journal_id, journal_type, move_type, __, __, first_id in move_groups:
+                    target = wizard._get_target_journal(Journal.browse(journal_id))
+                    if target and move_type and journal_type != target.type:
+                        mismatches[first_id] = target
+                if mismatches:
+                    first_id = min(mismatches)
+                    move = self.env["account.move"].browse(first_id)
+                    warnings.append(
+                        f"<li><b>Warning:</b> Move {move.name} has type '{move.move_type}' "
+                        f"but target journal type is '{mismatches[first_id].type}'. "
+                        "This may cause issues.</li>"
+                    )
 
                 # Check for related payments
-                related_payments = wizard._get_related_payments()
-                if related_payments:
+                payment_groups = stats["payment_groups"]
+                payment_count = sum(count for __, __, count, __ in payment_groups)
+                if payment_count:
                     warnings.append(
-                        f"<li><b>Info:</b> {len(related_payments)} payment(s) will also have their journal changed.</li>"
+                        f"<li><b>Info:</b> {payment_count} payment(s) will also have their journal changed.</li>"
                     )
 
                     # Check if target journal has proper payment method configuration
-                    for payment in related_payments:
-                        available_methods = wizard.journal_to_id._get_available_payment_method_lines(
-                            payment.payment_type
-                        )
-                        if not available_methods:
+                    for journal_id, payment_type, __, first_id in sorted(payment_groups, key=lambda g: g[3]):
+                        target = wizard._get_target_journal(Journal.browse(journal_id))
+                        if not target:
+                            continue
+                        availability = wizard._get_payment_method_availability(target, payment_type)
+                        if availability == "no_method":
+                            payment = self.env["account.payment"].browse(first_id)
                             warnings.append(
-                                f"<li><b>Error:</b> Journal '{wizard.journal_to_id.name}' has no payment methods "
-                                f"configured for {payment.payment_type} payments. "
+                                f"<li><b>Error:</b> Journal '{target.name}' has no payment methods "
+                                f"configured for {payment_type} payments. "
                                 f"Payment {payment.name} cannot be changed.</li>"
                             )
                             break
-
-                        # Check if any method has outstanding account
-                        methods_with_account = available_methods.filtered(lambda l: l.payment_account_id)
-                        if not methods_with_account:
-                            # Check company defaults
-                            company = wizard.journal_to_id.company_id
-                            if payment.payment_type == 'inbound':
-                                has_default = bool(company.account_journal_payment_debit_account_id)
-                            else:
-                                has_default = bool(company.account_journal_payment_credit_account_id)
-
-                            if not has_default:
-                                warnings.append(
-                                    f"<li><b>Error:</b> Journal '{wizard.journal_to_id.name}' payment methods "
-                                    f"have no outstanding account configured, and company has no defaults. "
-                                    f"Please configure the outstanding payments/receipts account.</li>"
-                                )
-                                break
+                        if availability == "no_account":
+                            warnings.append(
+                                f"<li><b>Error:</b> Journal '{target.name}' payment methods "
+                                f"have no outstanding account configured, and company has no defaults. "
+                                f"Please configure the outstanding payments/receipts account.</li>"
+                            )
+                            break
 
             if warnings:
                 wizard.warning_message = "<ul>" + "".join(warnings) + "</ul>"
@@ -184,37 +549,45 @@ class AccountMoveChangeJournal(models.TransientModel):
     def _validate_change(self):
         """Validate that the change can be performed"""
         self.ensure_one()
+        Move = self.env["account.move"]
+        domain = self._get_move_domain()
 
-        if not self.move_ids:
+        if not self.move_count:
             raise UserError(_("No moves selected to change journal."))
 
-        if not self.journal_to_id:
-            raise UserError(_("Please select a target journal."))
+        if self.target_mode == "mapping":
+            if not self._get_journal_mapping():
+                raise UserError(_("Please map at least one source journal to a different target journal."))
+            if not Move.search_count(domain + self._get_change_domain(), limit=1):
+                raise UserError(_("None of the selected moves belong to a mapped source journal."))
+        else:
+            if not self.journal_to_id:
+                raise UserError(_("Please select a target journal."))
 
-        # Check if any move is the same journal
-        same_journal_moves = self.move_ids.filtered(
-            lambda m: m.journal_id == self.journal_to_id
-        )
-        if same_journal_moves and len(same_journal_moves) == len(self.move_ids):
-            raise UserError(
-                _("All selected moves already belong to the target journal '%s'.")
-                % self.journal_to_id.name
-            )
+            # Check if any move is the same journal
+            if not Move.search_count(domain + self._get_change_domain(), limit=1):
+                raise UserError(
+                    _("All selected moves already belong to the target journal '%s'.")
+                    % self.journal_to_id.name
+                )
 
         # Validate that moves can be modified
-        for move in self.move_ids:
-            if move.state == "posted" and not self.force_change:
-                if move.restrict_mode_hash_table:
-                    raise UserError(
-                        _("Cannot change journal of move '%s' because it is posted "
-                          "and locked by hash. Please use 'Force Change' if you really "
-                          "need to proceed (not recommended).") % move.name
-                    )
+        if not self.force_change:
+            locked_move = Move.search(domain + self._get_change_domain() + [
+                ("state", "=", "posted"),
+                ("restrict_mode_hash_table", "=", True),
+            ], order="id", limit=1)
+            if locked_move:
+                raise UserError(
+                    _("Cannot change journal of move '%s' because it is posted "
+                      "and locked by hash. Please use 'Force Change' if you really "
+                      "need to proceed (not recommended).") % locked_move.name
+                )
 
     def _prepare_move_values(self, move):
         """Prepare the values to update the move"""
         values = {
-            "journal_id": self.journal_to_id.id,
+            "journal_id": self._get_journal_to().id,
         }
 
         # Reset sequence if requested
@@ -223,104 +596,68 @@ class AccountMoveChangeJournal(models.TransientModel):
 
         return values
 
-    def _change_payment_journal(self, payment):
-        """Change the journal of a related payment"""
-        try:
-            old_journal = payment.journal_id.name
+    def _get_payment_target_values(self, payment, resolver=None):
+        """Resolve the payment method line and receiptbook for the target journal
 
-            # Get a compatible payment method line for the new journal
-            available_method_lines = self.journal_to_id._get_available_payment_method_lines(
-                payment.payment_type
-            )
+        Returns a tuple (payment_method_line, receiptbook_id, error)
+        """
+        if resolver is None:
+            resolver = PaymentTargetResolver(self.env)
+        return resolver.resolve(self._get_journal_to(), payment)
 
-            # Try to find a payment method with the same code that has an outstanding account
-            new_payment_method_line = False
-            if payment.payment_method_line_id:
-                current_code = payment.payment_method_line_id.code
-                # First try to find one with the same code AND with payment_account_id
-                matching_method = available_method_lines.filtered(
-                    lambda l: l.code == current_code and l.payment_account_id
-                )
-                if matching_method:
-                    new_payment_method_line = matching_method[0]
-                else:
-                    # If not found with account, try just with same code
-                    matching_method = available_method_lines.filtered(
-                        lambda l: l.code == current_code
-                    )
-                    if matching_method:
-                        new_payment_method_line = matching_method[0]
+    def _get_payment_partials(self, payments):
+        """Get the partial reconciles of all the lines of the payments' moves
 
-            # If still not found, try to get any method with payment_account_id
-            if not new_payment_method_line:
-                methods_with_account = available_method_lines.filtered(
-                    lambda l: l.payment_account_id
-                )
-                if methods_with_account:
-                    new_payment_method_line = methods_with_account[0]
-                elif available_method_lines:
-                    new_payment_method_line = available_method_lines[0]
-
-            # Validate that we have a valid payment method
-            if not new_payment_method_line:
-                return False, _(
-                    "The target journal '%s' has no payment methods configured for %s payments."
-                ) % (self.journal_to_id.name, payment.payment_type)
-
-            # Check if the payment method has an outstanding account
-            # If not, check if the journal has a default account we can use
-            if not new_payment_method_line.payment_account_id:
-                # Check company's default outstanding accounts
-                company = self.journal_to_id.company_id
-                if payment.payment_type == 'inbound':
-                    default_account = company.account_journal_payment_debit_account_id
-                else:
-                    default_account = company.account_journal_payment_credit_account_id
-
-                if not default_account:
-                    return False, _(
-                        "The payment method '%s' in journal '%s' has no outstanding account configured, "
-                        "and the company has no default outstanding account. "
-                        "Please configure the outstanding payments/receipts account in the journal or company settings."
-                    ) % (new_payment_method_line.name, self.journal_to_id.name)
-
-            # Get the appropriate receiptbook for the new journal's company
-            new_receiptbook_id = False
-            if not payment.is_internal_transfer:
-                # Check if the company uses receiptbooks
-                new_company = self.journal_to_id.company_id
-                if hasattr(new_company, 'use_receiptbook') and new_company.use_receiptbook:
-                    new_receiptbook = self.env["account.payment.receiptbook"].search([
-                        ("partner_type", "=", payment.partner_type),
-                        ("company_id", "=", new_company.id),
-                    ], limit=1)
-                    if new_receiptbook:
-                        new_receiptbook_id = new_receiptbook.id
-
-            # STEP 1: Unreconcile ALL payment lines to reset matched_amount fields
-            # This must be done BEFORE changing the journal
-            #
-            # Changed logic: Instead of filtering by account_type, we now get ALL lines
-            # from the payment move and unreconcile any that have partial reconciliations.
-            # This ensures both inbound (receipts/cobranzas) and outbound (payments/pagos)
-            # are handled equally, regardless of their account types.
-            payment_lines = payment.move_id.line_ids
-
-            # Get all partial reconciles for ALL lines in the payment move
-            partials_to_remove = self.env['account.partial.reconcile']
-            for line in payment_lines:
-                # Only process lines that are actually reconciled
-                if line.matched_debit_ids or line.matched_credit_ids:
-                    partials_to_remove |= line.matched_debit_ids
-                    partials_to_remove |= line.matched_credit_ids
+        Returns a list of (payment_id, partial_id, full_reconcile_id) rows,
+        obtained with a single query.
+        """
+        if not payments:
+            return []
+        self.env["account.payment"].flush_model(["move_id"])
+        self.env["account.move.line"].flush_model(["move_id"])
+        self.env["account.partial.reconcile"].flush_model(
+            ["debit_move_id", "credit_move_id", "full_reconcile_id"]
+        )
+        self.env.cr.execute(SQL("""
+            SELECT DISTINCT payment.id, partial.id, partial.full_reconcile_id
+              FROM account_partial_reconcile partial
+              JOIN account_move_line line
+                ON line.id IN (partial.debit_move_id, partial.credit_move_id)
+              JOIN account_payment payment ON payment.move_id = line.move_id
+             WHERE payment.id = ANY(%s)
+        """, payments.ids))
+        return self.env.cr.fetchall()
+
+    def _unreconcile_payments(self, payments, unreconcile_stats=None):
+        """Remove the partial reconciles of all the lines of the payments' moves
+
+        The partials are collected with a single query and removed with a single
+        unlink(). The number of partial and full reconciles removed is added to
+        ``unreconcile_stats`` when given.
+        """
+        with self._profile_stage("unreconcile") as stage:
+            rows = {(partial_id, full_reconcile_id) for __, partial_id, full_reconcile_id in self._get_payment_partials(payments)}
+            if not rows:
+                return
 
             # Unlink the partial reconciles (this will reset matched_move_line_ids,
-            # matched_amount, unmatched_amount when computed fields recalculate)
-            if partials_to_remove:
-                partials_to_remove.unlink()
+            # matched_amount, unmatched_amount when computed fields recalculate).
+            # The full reconciles and exchange difference moves are cleaned up by
+            # the partials' unlink() once for the whole batch.
+            partials_to_remove = self.env["account.partial.reconcile"].browse([partial_id for partial_id, __ in rows])
+            self._snapshot_partials(partials_to_remove.ids)
+            partials_to_remove.unlink()
+            stage["row_count"] += len(rows)
+
+        if unreconcile_stats is not None:
+            unreconcile_stats["partial_count"] += len(rows)
+            unreconcile_stats["full_reconcile_count"] += len({full_id for __, full_id in rows if full_id})
 
-            # STEP 2: Update payment using direct SQL to avoid _synchronize_to_moves
-            # which tries to update readonly fields on posted moves
+    def _update_payments_journal(self, payments, payment_method_line, receiptbook_id):
+        """Write the new journal on the payments with a single UPDATE statement"""
+        # Update payment using direct SQL to avoid _synchronize_to_moves
+        # which tries to update readonly fields on posted moves
+        with self._profile_stage("payment_update") as stage:
             self.env.cr.execute("""
                 UPDATE account_payment
                 SET journal_id = %s,
@@ -329,112 +666,943 @@ class AccountMoveChangeJournal(models.TransientModel):
                     is_reconciled = false,
                     write_date = NOW(),
                     write_uid = %s
-                WHERE id = %s
+                WHERE id IN %s
             """, (
-                self.journal_to_id.id,
-                new_payment_method_line.id,
-                new_receiptbook_id if new_receiptbook_id else None,
+                self._get_journal_to().id,
+                payment_method_line.id,
+                receiptbook_id if receiptbook_id else None,
                 self.env.uid,
-                payment.id,
+                tuple(payments.ids),
             ))
+            stage["row_count"] += self.env.cr.rowcount
+
+        self._refresh_payments_cache(payments, payment_method_line, receiptbook_id)
+
+    def _refresh_payments_cache(self, payments, payment_method_line, receiptbook_id):
+        """Bring the cache of the payments in line with the UPDATE done in SQL
+
+        The values written by the UPDATE are known, so they are put in the
+        cache of all the payments at once instead of being read again, and only
+        the fields depending on them or on the removed reconciliations are
+        invalidated, in a single call. The rest of the prefetched data stays
+        available for the following steps.
+        """
+        written_values = {
+            "journal_id": self._get_journal_to().id,
+            "payment_method_line_id": payment_method_line.id,
+            "receiptbook_id": receiptbook_id or None,
+            "is_reconciled": False,
+        }
+        dependent_fields = [
+            # Depend on the reconciliation of the payment lines
+            "matched_move_line_ids",
+            "matched_amount",
+            "matched_amount_untaxed",
+            "unmatched_amount",
+            "reconciled_invoice_ids",
+            "reconciled_bill_ids",
+            # Depend on the journal and payment method line
+            "available_payment_method_line_ids",
+            "outstanding_account_id",
+        ]
+        payments.invalidate_recordset([
+            fname
+            for fname in list(written_values) + dependent_fields
+            if fname in payments._fields
+        ])
+        for fname, value in written_values.items():
+            if fname in payments._fields:
+                self.env.cache.update(payments, payments._fields[fname], [value] * len(payments))
+
+    def _get_payment_change_message(self, old_journal_name):
+        """Message logged on a payment whose journal has been changed"""
+        return _(
+            "Journal changed from <b>%s</b> to <b>%s</b> (updated automatically with related move)"
+        ) % (old_journal_name, self._get_journal_to().name)
+
+    def _get_move_change_message(self, old_journal_name, old_name, new_name):
+        """Message logged on a move whose journal has been changed"""
+        message = _(
+            "Journal changed from <b>%s</b> to <b>%s</b>"
+        ) % (old_journal_name, self._get_journal_to().name)
+
+        if old_name != new_name:
+            message += _("<br/>Sequence changed from <b>%s</b> to <b>%s</b>") % (
+                old_name,
+                new_name,
+            )
+        return message
+
+    def _get_audit_old_values(self, records):
+        """Values of the moves or payments to keep in the audit trail, read before the change"""
+        if records._name == "account.payment":
+            has_receiptbook = "receiptbook_id" in records._fields
+            return {
+                payment.id: {
+                    "journal": payment.journal_id,
+                    "name": payment.name,
+                    "payment_method_line": payment.payment_method_line_id,
+                    "receiptbook_id": payment.receiptbook_id.id if has_receiptbook else False,
+                }
+                for payment in records
+            }
+        return {
+            move.id: {
+                "journal": move.journal_id,
+                "name": move.name,
+                "sequence_prefix": move.sequence_prefix,
+                "sequence_number": move.sequence_number,
+            }
+            for move in records
+        }
+
+    def _record_changes(self, records, old_values):
+        """Keep the audit trail and the revert snapshot of changed moves or payments"""
+        self._audit_changes(records, old_values)
+        self._snapshot_changes(records, old_values)
+
+    def _snapshot_changes(self, records, old_values):
+        """Collect the old values of the changed moves or payments for a later revert"""
+        snapshot = self.env.context.get("change_journal_snapshot")
+        if snapshot is None or not records:
+            return
+        is_payment = records._name == "account.payment"
+        for record in records:
+            old = old_values[record.id]
+            values = {
+                "record_type": "payment" if is_payment else "move",
+                "move_id": False if is_payment else record.id,
+                "payment_id": record.id if is_payment else False,
+                "old_journal_id": old["journal"].id,
+                "new_journal_id": self._get_journal_to().id,
+                "old_name": old["name"],
+            }
+            if is_payment:
+                values.update({
+                    "old_payment_method_line_id": old["payment_method_line"].id,
+                    "old_receiptbook_id": old["receiptbook_id"],
+                })
+            else:
+                values.update({
+                    "old_sequence_prefix": old["sequence_prefix"],
+                    "old_sequence_number": old["sequence_number"],
+                })
+            snapshot.records.append(values)
+
+    def _snapshot_partials(self, partial_ids):
+        """Collect the partial reconciles about to be removed for a later revert"""
+        snapshot = self.env.context.get("change_journal_snapshot")
+        if snapshot is None or not partial_ids:
+            return
+        self.env.cr.execute(SQL("""
+            SELECT debit_move_id, credit_move_id, amount,
+                   debit_amount_currency, credit_amount_currency, full_reconcile_id
+              FROM account_partial_reconcile
+             WHERE id = ANY(%s)
+        """, list(partial_ids)))
+        snapshot.partials += [
+            {
+                "debit_move_id": debit_move_id,
+                "credit_move_id": credit_move_id,
+                "amount": amount,
+                "debit_amount_currency": debit_amount_currency,
+                "credit_amount_currency": credit_amount_currency,
+                "full_reconcile_ref": full_reconcile_id or 0,
+            }
+            for debit_move_id, credit_move_id, amount, debit_amount_currency,
+            credit_amount_currency, full_reconcile_id in self.env.cr.fetchall()
+        ]
+
+    def _snapshot_checkpoint(self):
+        """Position of the revert snapshot, to restore when a savepoint is rolled back"""
+        snapshot = self.env.context.get("change_journal_snapshot")
+        return snapshot.checkpoint() if snapshot is not None else None
+
+    def _snapshot_restore(self, checkpoint):
+        """Drop the snapshot rows collected since the checkpoint"""
+        snapshot = self.env.context.get("change_journal_snapshot")
+        if snapshot is not None:
+            snapshot.restore(checkpoint)
+
+    def _prepare_log_values(self, records, old_values):
+        """Prepare one change log row per changed move or payment"""
+        is_payment = records._name == "account.payment"
+        vals_list = []
+        for record in records:
+            old = old_values[record.id]
+            vals_list.append({
+                "batch_ref": self.batch_ref,
+                "record_type": "payment" if is_payment else "move",
+                "move_id": record.move_id.id if is_payment else record.id,
+                "payment_id": record.id if is_payment else False,
+                "company_id": record.company_id.id,
+                "user_id": self.env.uid,
+                "old_journal_id": old["journal"].id,
+                "new_journal_id": self._get_journal_to().id,
+                "old_name": old["name"],
+                "new_name": record.name,
+                "old_payment_method_line_id": old["payment_method_line"].id if is_payment else False,
+                "new_payment_method_line_id": record.payment_method_line_id.id if is_payment else False,
+            })
+        return vals_list
+
+    def _audit_changes(self, records, old_values):
+        """Record the journal change of the given moves or payments in the audit trail"""
+        if not records or self.env.context.get("change_journal_dry_run"):
+            return
+
+        with self._profile_stage("audit") as stage:
+            self._write_audit_trail(records, old_values)
+            stage["row_count"] += len(records)
 
-            # Invalidate cache to ensure Odoo sees the new values
-            payment.invalidate_recordset(['journal_id', 'payment_method_line_id', 'receiptbook_id', 'is_reconciled'])
-            # Also invalidate the computed fields that depend on reconciliation
-            payment.invalidate_recordset(['matched_move_line_ids', 'matched_amount', 'unmatched_amount'])
-
-            # Recompute dependent fields
-            payment.invalidate_recordset([
-                'currency_id',
-                'available_payment_method_line_ids',
-                'outstanding_account_id',
-                'company_id',
-            ])
-
-            # Post message in chatter for audit trail
-            message = _(
-                "Journal changed from <b>%s</b> to <b>%s</b> (updated automatically with related move)"
-            ) % (old_journal, self.journal_to_id.name)
-
-            payment.message_post(body=message)
-            return True, None
+    def _write_audit_trail(self, records, old_values):
+        """Write the chatter messages or change log rows of the audit trail"""
+        if self.audit_mode == "log":
+            # The users whose changes are audited only read the log
+            self.env["account.move.change.journal.log"].sudo().create(
+                self._prepare_log_values(records, old_values)
+            )
+            return
+
+        if records._name == "account.payment":
+            bodies = {
+                payment.id: self._get_payment_change_message(old_values[payment.id]["journal"].name)
+                for payment in records
+            }
+        else:
+            bodies = {
+                move.id: self._get_move_change_message(
+                    old_values[move.id]["journal"].name,
+                    old_values[move.id]["name"],
+                    move.name,
+                )
+                for move in records
+            }
+
+        if self.bulk_mode:
+            records._message_log_batch(bodies=bodies)
+        else:
+            for record in records:
+                record.message_post(body=bodies[record.id])
+
+    def _post_audit_summary(self, result):
+        """Post a single message summarizing the execution on each target journal"""
+        if self.env.context.get("change_journal_dry_run"):
+            return
+        if not self.audit_summary or not (result["changed_moves"] or result["changed_payments"]):
+            return
+        move_counts = dict(self.env["account.move"]._read_group(
+            [("id", "in", result["changed_moves"].ids)], ["journal_id"], ["__count"],
+        ))
+        payment_counts = dict(self.env["account.payment"]._read_group(
+            [("id", "in", result["changed_payments"].ids)], ["journal_id"], ["__count"],
+        ))
+        for journal in self._get_target_journals():
+            if not (move_counts.get(journal) or payment_counts.get(journal)):
+                continue
+            journal.message_post(body=_(
+                "Batch <b>%s</b>: %s move(s) and %s payment(s) changed to this journal."
+            ) % (
+                self.batch_ref,
+                move_counts.get(journal, 0),
+                payment_counts.get(journal, 0),
+            ))
+
+    def _change_payment_journal(self, payment, unreconcile_stats=None, resolver=None):
+        """Change the journal of a related payment
+
+        The change runs in a savepoint, so a database error only rolls back
+        this payment and leaves the transaction usable for the next ones.
+        """
+        payment_stats = defaultdict(int)
+        checkpoint = self._snapshot_checkpoint()
+        try:
+            old_values = self._get_audit_old_values(payment)
+
+            new_payment_method_line, new_receiptbook_id, error = self._get_payment_target_values(
+                payment, resolver
+            )
+            if error:
+                return False, error
+
+            with self.env.cr.savepoint():
+                # STEP 1: Unreconcile ALL payment lines to reset matched_amount fields
+                # This must be done BEFORE changing the journal
+                #
+                # Changed logic: Instead of filtering by account_type, we now get ALL lines
+                # from the payment move and unreconcile any that have partial reconciliations.
+                # This ensures both inbound (receipts/cobranzas) and outbound (payments/pagos)
+                # are handled equally, regardless of their account types.
+                self._unreconcile_payments(payment, payment_stats)
+
+                # STEP 2: Update payment using direct SQL
+                self._update_payments_journal(payment, new_payment_method_line, new_receiptbook_id)
+
+                # Keep the audit trail
+                self._record_changes(payment, old_values)
+        except (LockNotAvailable, SerializationFailure):
+            # Concurrency errors apply to the whole partition, see _execute_change()
+            raise
         except Exception as e:
+            self._snapshot_restore(checkpoint)
             return False, str(e)
 
-    def action_change_journal(self):
-        """Execute the journal change"""
-        self.ensure_one()
-        self._validate_change()
+        if unreconcile_stats is not None:
+            for key, value in payment_stats.items():
+                unreconcile_stats[key] += value
+        return True, None
 
-        moves_to_change = self.move_ids.filtered(
-            lambda m: m.journal_id != self.journal_to_id
+    def _change_move_journal(self, move):
+        """Change the journal of a single move
+
+        The write and its flush run in a savepoint, so a database error only
+        rolls back this move and leaves the transaction usable for the next ones.
+        """
+        checkpoint = self._snapshot_checkpoint()
+        try:
+            old_values = self._get_audit_old_values(move)
+
+            # Prepare values
+            values = self._prepare_move_values(move)
+
+            with self.env.cr.savepoint():
+                # Write changes with proper context
+                with self._profile_stage("move_write") as stage:
+                    move.with_context(
+                        check_move_validity=False,
+                        skip_invoice_sync=True,
+                        skip_account_move_synchronization=True,
+                    ).write(values)
+                    move.flush_recordset()
+                    stage["row_count"] += 1
+
+                # If name was reset and move is posted, trigger renumbering
+                if self.reset_sequence and values.get("name") == "/" and move.state == "posted":
+                    # Odoo will automatically assign a new number on write
+                    with self._profile_stage("renumber") as stage:
+                        move._compute_name()
+                        move.flush_recordset(["name"])
+                        stage["row_count"] += 1
+
+                # Keep the audit trail
+                self._record_changes(move, old_values)
+        except (LockNotAvailable, SerializationFailure):
+            # Concurrency errors apply to the whole partition, see _execute_change()
+            raise
+        except Exception as e:
+            self._snapshot_restore(checkpoint)
+            return False, str(e)
+        return True, None
+
+    def _get_sequence_bucket_key(self, move):
+        """Key of the sequence a move is numbered from in its journal
+
+        Built from what _set_next_sequence() uses to find the last number:
+        the WHERE clause and parameters of _get_last_sequence_domain() (the
+        journal, the refund/payment sub-sequence and the reset period of the
+        last number), plus the date range of the starting sequence for a
+        journal without numbers in that period yet.
+        """
+        where_string, param = move._get_last_sequence_domain()
+        reset = move._deduce_sequence_number_reset(move._get_starting_sequence())
+        return (
+            where_string,
+            tuple(sorted(param.items())),
+            move._get_sequence_date_range(reset),
         )
 
-        if not moves_to_change:
-            raise UserError(_("No moves to change. All moves already belong to the target journal."))
+    def _renumber_moves(self, moves):
+        """Assign new sequence numbers to the moves from their (new) journal
 
-        # Get related payments before changing moves
-        related_payments = self._get_related_payments()
+        For each sequence bucket only the first move goes through the standard
+        _set_next_sequence(), which looks up and locks the journal sequence.
+        The rest of the bucket gets the following numbers of a contiguous
+        block, in date order, without further lookups.
+        """
+        with self._profile_stage("renumber") as stage:
+            buckets = defaultdict(list)
+            for move in moves.sorted(lambda m: (m.date, m.id)):
+                buckets[self._get_sequence_bucket_key(move)].append(move)
 
-        # Process each move
-        changed_moves = self.env["account.move"]
+            # Buckets are created in date order, and _set_next_sequence() flushes
+            # the names assigned so far, so each block starts after the previous one
+            for bucket in buckets.values():
+                first_move = bucket[0]
+                first_move._set_next_sequence()
+                format_string, format_values = first_move._get_sequence_format_param(first_move.name)
+                for move in bucket[1:]:
+                    format_values["seq"] += 1
+                    move.name = format_string.format(**format_values)
+
+            moves.flush_recordset(["name"])
+            stage["row_count"] += len(moves)
+
+    def _change_payments_bulk(self, payments, unreconcile_stats=None, resolver=None):
+        """Change the journal of the payments grouped by (target payment
+        method line, receiptbook), one UPDATE per group.
+
+        Returns a tuple (changed_payments, errors)
+        """
         changed_payments = self.env["account.payment"]
         errors = []
 
+        old_values = self._get_audit_old_values(payments)
+        groups = defaultdict(list)
+        with self._profile_stage("resolve") as stage:
+            for payment in payments:
+                new_payment_method_line, new_receiptbook_id, error = self._get_payment_target_values(
+                    payment, resolver
+                )
+                if error:
+                    errors.append(f"Payment {payment.name}: {error}")
+                    continue
+                key = (new_payment_method_line, new_receiptbook_id)
+                groups[key].append(payment.id)
+            stage["row_count"] += len(payments)
+
+        # STEP 1: Unreconcile all the payments of all the groups at once
+        payments_to_change = self.env["account.payment"].browse(
+            [payment_id for payment_ids in groups.values() for payment_id in payment_ids]
+        )
+        checkpoint = self._snapshot_checkpoint()
+        try:
+            with self.env.cr.savepoint():
+                batch_stats = defaultdict(int)
+                self._unreconcile_payments(payments_to_change, batch_stats)
+        except (LockNotAvailable, SerializationFailure):
+            # Concurrency errors apply to the whole partition, see _execute_change()
+            raise
+        except Exception:
+            self._snapshot_restore(checkpoint)
+            # Replay every payment record by record to report the offending ones
+            for payment in payments_to_change:
+                success, error = self._change_payment_journal(payment, unreconcile_stats, resolver)
+                if success:
+                    changed_payments |= payment
+                else:
+                    errors.append(f"Payment {payment.name}: {error}")
+            return changed_payments, errors
+
+        if unreconcile_stats is not None:
+            for key, value in batch_stats.items():
+                unreconcile_stats[key] += value
+
+        # STEP 2: One UPDATE per group
+        for (payment_method_line, receiptbook_id), payment_ids in groups.items():
+            group = self.env["account.payment"].browse(payment_ids)
+            checkpoint = self._snapshot_checkpoint()
+            try:
+                with self.env.cr.savepoint():
+                    self._update_payments_journal(group, payment_method_line, receiptbook_id)
+                    self._record_changes(group, old_values)
+            except (LockNotAvailable, SerializationFailure):
+                # Concurrency errors apply to the whole partition, see _execute_change()
+                raise
+            except Exception:
+                self._snapshot_restore(checkpoint)
+                # Replay the group record by record to report the offending payments
+                for payment in group:
+                    success, error = self._change_payment_journal(payment, unreconcile_stats, resolver)
+                    if success:
+                        changed_payments |= payment
+                    else:
+                        errors.append(f"Payment {payment.name}: {error}")
+                continue
+            changed_payments |= group
+
+        return changed_payments, errors
+
+    def _change_moves_bulk(self, moves):
+        """Change the journal of the moves grouped by source journal, one
+        write() per group, then one renumbering of all the moves together.
+
+        All the moves go to the same journal, so they are renumbered together
+        to get their numbers in date order across the source journals.
+
+        Returns a tuple (changed_moves, errors)
+        """
+        changed_moves = self.env["account.move"]
+        errors = []
+        values = self._prepare_move_values(moves)
+
+        old_values = self._get_audit_old_values(moves)
+
+        groups = list(moves.grouped("journal_id").values())
+        failed_groups = []
+        checkpoint = self._snapshot_checkpoint()
+        try:
+            with self.env.cr.savepoint():
+                written_moves = self.env["account.move"]
+                for group in groups:
+                    try:
+                        with self.env.cr.savepoint():
+                            with self._profile_stage("move_write") as stage:
+                                group.with_context(
+                                    check_move_validity=False,
+                                    skip_invoice_sync=True,
+                                    skip_account_move_synchronization=True,
+                                ).write(values)
+                                group.flush_recordset()
+                                stage["row_count"] += len(group)
+                    except (LockNotAvailable, SerializationFailure):
+                        # Concurrency errors apply to the whole partition, see _execute_change()
+                        raise
+                    except Exception:
+                        failed_groups.append(group)
+                        continue
+                    written_moves |= group
+
+                if self.reset_sequence and values.get("name") == "/":
+                    self._renumber_moves(written_moves.filtered(lambda m: m.state == "posted"))
+
+                self._record_changes(written_moves, old_values)
+        except (LockNotAvailable, SerializationFailure):
+            # Concurrency errors apply to the whole partition, see _execute_change()
+            raise
+        except Exception:
+            _logger.warning(
+                "Journal change %s: bulk change of %s move(s) failed, replaying them record by record",
+                self.batch_ref, len(moves), exc_info=True,
+            )
+            self._snapshot_restore(checkpoint)
+            written_moves = self.env["account.move"]
+            failed_groups = groups
+        changed_moves |= written_moves
+
+        # Replay the failed groups record by record to report the offending moves
+        for group in failed_groups:
+            for move in group:
+                success, error = self._change_move_journal(move)
+                if success:
+                    changed_moves |= move
+                else:
+                    errors.append(f"Move {move.name}: {error}")
+
+        return changed_moves, errors
+
+    def _profile_stage(self, name):
+        """Context manager measuring a stage of the execution, see ChangeJournalProfiler"""
+        profiler = self.env.context.get("change_journal_profiler")
+        if profiler is None:
+            return nullcontext({"row_count": 0})
+        return profiler.stage(name)
+
+    def _get_profiling_log_level(self):
+        """Level of the per-stage profiling lines in the server log"""
+        param = self.env["ir.config_parameter"].sudo().get_param(
+            "account_move_change_journal.profiling_log_level", "info"
+        )
+        level = logging.getLevelName(param.upper())
+        return level if isinstance(level, int) else logging.INFO
+
+    def _prepare_run_values(self):
+        """Prepare the values of the run record storing the measures of an execution"""
+        return {
+            "batch_ref": self.batch_ref,
+            "company_id": self.company_id.id,
+            "journal_to_id": self.journal_to_id.id,
+            "journal_to_ids": [Command.set(self._get_target_journals().ids)],
+            "user_id": self.env.uid,
+        }
+
+    def _prepare_run_batch_values(self, run, result, profiler, duration, query_count):
+        """Prepare the values adding the result and the measures of a batch to the run"""
+        stages = {stage.name: stage for stage in run.stage_ids}
+        sequence = len(stages)
+        stage_commands = []
+        for name, measure in profiler.stages.items():
+            stage = stages.get(name)
+            if stage:
+                stage_commands.append(Command.update(stage.id, {
+                    "duration": stage.duration + measure["duration"],
+                    "query_count": stage.query_count + measure["query_count"],
+                    "row_count": stage.row_count + measure["row_count"],
+                    "call_count": stage.call_count + measure["call_count"],
+                    "peak_memory": max(stage.peak_memory, measure["peak_memory"] // 1024),
+                }))
+                continue
+            stage_commands.append(Command.create({
+                "sequence": sequence,
+                "name": name,
+                "duration": measure["duration"],
+                "query_count": measure["query_count"],
+                "row_count": measure["row_count"],
+                "call_count": measure["call_count"],
+                "peak_memory": measure["peak_memory"] // 1024,
+            }))
+            sequence += 1
+        return {
+            "changed_move_count": run.changed_move_count + len(result["changed_moves"]),
+            "changed_payment_count": run.changed_payment_count + len(result["changed_payments"]),
+            "skipped_move_count": run.skipped_move_count + len(result["skipped_moves"]),
+            "error_count": run.error_count + len(result["errors"]),
+            "partial_count": run.partial_count + result["partial_count"],
+            "full_reconcile_count": run.full_reconcile_count + result["full_reconcile_count"],
+            "duration": run.duration + duration,
+            "query_count": run.query_count + query_count,
+            "stage_ids": stage_commands,
+        }
+
+    def _log_profiling(self, run):
+        """Write the per-stage measures of the run in the server log"""
+        level = self._get_profiling_log_level()
+        if not _logger.isEnabledFor(level):
+            return
+        _logger.log(
+            level, "Journal change %s: %s move(s), %s payment(s) in %.3fs, %s queries",
+            run.batch_ref, run.changed_move_count, run.changed_payment_count, run.duration, run.query_count,
+        )
+        for stage in run.stage_ids:
+            _logger.log(
+                level, "Journal change %s: stage %s: %.3fs, %s queries, %s rows, %s call(s), peak memory %s KiB",
+                run.batch_ref, stage.name, stage.duration, stage.query_count, stage.row_count, stage.call_count,
+                stage.peak_memory,
+            )
+
+    def _log_resolver_stats(self, resolver):
+        """Log the hit/miss counters of the payment target resolver"""
+        _logger.info(
+            "Journal change %s: payment target resolver served %s payment(s) from cache, %s lookup(s)",
+            self.batch_ref, resolver.hits, resolver.misses,
+        )
+
+    def _apply_change(self, moves, unreconcile_stats, resolver):
+        """Change the journal of the given moves and their related payments
+
+        Returns a tuple (changed_moves, changed_payments, errors)
+        """
+        self.ensure_one()
+
+        # Get related payments before changing moves
+        journal_to = self._get_journal_to()
+        related_payments = self._get_related_payments(moves).filtered(
+            lambda p: p.journal_id != journal_to
+        )
+
         # IMPORTANT: First process payments, then moves
         # This is because the payment's _synchronize_to_moves method would overwrite
         # the move's journal_id if we did it the other way around.
         # By changing payments first with skip_account_move_synchronization=True,
         # then changing moves, we ensure both stay in sync.
+        if self.bulk_mode:
+            changed_payments, payment_errors = self._change_payments_bulk(
+                related_payments, unreconcile_stats, resolver
+            )
+            changed_moves, move_errors = self._change_moves_bulk(moves)
+            return changed_moves, changed_payments, payment_errors + move_errors
+
+        changed_moves = self.env["account.move"]
+        changed_payments = self.env["account.payment"]
+        errors = []
 
         # Process related payments FIRST
         for payment in related_payments:
-            if payment.journal_id != self.journal_to_id:
-                success, error = self._change_payment_journal(payment)
-                if success:
-                    changed_payments |= payment
-                else:
-                    errors.append(f"Payment {payment.name}: {error}")
+            success, error = self._change_payment_journal(payment, unreconcile_stats, resolver)
+            if success:
+                changed_payments |= payment
+            else:
+                errors.append(f"Payment {payment.name}: {error}")
 
         # Then process moves
-        for move in moves_to_change:
+        for move in moves:
+            success, error = self._change_move_journal(move)
+            if success:
+                changed_moves |= move
+            else:
+                errors.append(f"Move {move.name}: {error}")
+
+        return changed_moves, changed_payments, errors
+
+    def _apply_change_isolated(self, moves, unreconcile_stats, resolver, failures):
+        """Change the journal of the given moves, isolating the failing ones
+
+        Each chunk of moves runs in its own savepoint. A chunk reporting errors
+        is rolled back and split in two until the moves failing on their own
+        are found, each one along with its payments is then left unchanged and
+        appended to failures with its reasons. All other changes are kept.
+
+        Returns a tuple (changed_moves, changed_payments, errors)
+        """
+        self.ensure_one()
+        changed_moves = self.env["account.move"]
+        changed_payments = self.env["account.payment"]
+        errors = []
+        chunk_size = max(self.chunk_size, 1)
+        pending = [moves[i:i + chunk_size] for i in range(0, len(moves), chunk_size)]
+        while pending:
+            chunk = pending.pop(0)
+            chunk_stats = {"partial_count": 0, "full_reconcile_count": 0}
+            checkpoint = self._snapshot_checkpoint()
             try:
-                old_journal = move.journal_id.name
-                old_name = move.name
+                with self.env.cr.savepoint():
+                    chunk_moves, chunk_payments, chunk_errors = self._apply_change(
+                        chunk, chunk_stats, resolver
+                    )
+                    if chunk_errors:
+                        raise _ChunkFailure(chunk_errors)
+            except (LockNotAvailable, SerializationFailure):
+                # Concurrency errors apply to the whole partition, see _execute_change()
+                raise
+            except Exception as e:
+                self._snapshot_restore(checkpoint)
+                if len(chunk) > 1:
+                    half = len(chunk) // 2
+                    pending[:0] = [chunk[:half], chunk[half:]]
+                    continue
+                reasons = e.errors if isinstance(e, _ChunkFailure) else [str(e)]
+                failures.append({
+                    "move_id": chunk.id,
+                    "name": chunk.name,
+                    "reasons": reasons,
+                })
+                errors += reasons
+                continue
+            changed_moves |= chunk_moves
+            changed_payments |= chunk_payments
+            for key, value in chunk_stats.items():
+                unreconcile_stats[key] += value
+        return changed_moves, changed_payments, errors
 
-                # Prepare values
-                values = self._prepare_move_values(move)
+    def _lock_records(self, moves):
+        """Lock the moves and their payments with SELECT ... FOR UPDATE SKIP LOCKED
 
-                # Write changes with proper context
-                move.with_context(
-                    check_move_validity=False,
-                    skip_invoice_sync=True,
-                    skip_account_move_synchronization=True,
-                ).write(values)
+        A move is skipped when it, or one of its payments, is locked by another
+        transaction (another journal change, a payment being posted...) or was
+        changed by a transaction committed after ours started.
 
-                # If name was reset and move is posted, trigger renumbering
-                if self.reset_sequence and values.get("name") == "/" and move.state == "posted":
-                    # Odoo will automatically assign a new number on write
-                    move._compute_name()
+        Returns a tuple (locked_moves, skipped_moves)
+        """
+        with self._profile_stage("lock") as stage:
+            try:
+                with self.env.cr.savepoint():
+                    locked_moves, skipped_moves = self._lock_rows(moves)
+            except (LockNotAvailable, SerializationFailure):
+                # Under REPEATABLE READ, rows changed by a transaction committed
+                # after ours started cannot be locked: lock the moves one by one
+                # to skip only the ones concerned
+                locked_moves = self.env["account.move"]
+                for move in moves:
+                    try:
+                        with self.env.cr.savepoint():
+                            locked_moves |= self._lock_rows(move)[0]
+                    except (LockNotAvailable, SerializationFailure):
+                        continue
+                skipped_moves = moves - locked_moves
+            stage["row_count"] += len(locked_moves)
+        return locked_moves, skipped_moves
 
-                # Post message in chatter for audit trail
-                message = _(
-                    "Journal changed from <b>%s</b> to <b>%s</b>"
-                ) % (old_journal, self.journal_to_id.name)
+    def _lock_rows(self, moves):
+        """Run the SELECT ... FOR UPDATE SKIP LOCKED queries of _lock_records()"""
+        self.env.cr.execute(SQL("""
+            SELECT id FROM account_move
+             WHERE id = ANY(%s)
+               FOR UPDATE SKIP LOCKED
+        """, moves.ids))
+        locked_move_ids = {row[0] for row in self.env.cr.fetchall()}
 
-                if old_name != move.name:
-                    message += _("<br/>Sequence changed from <b>%s</b> to <b>%s</b>") % (
-                        old_name,
-                        move.name,
-                    )
+        self.env.cr.execute(SQL("""
+            SELECT id, move_id FROM account_payment
+             WHERE move_id = ANY(%s)
+        """, list(locked_move_ids)))
+        payment_moves = dict(self.env.cr.fetchall())
 
-                move.message_post(body=message)
-                changed_moves |= move
+        self.env.cr.execute(SQL("""
+            SELECT id FROM account_payment
+             WHERE id = ANY(%s)
+               FOR UPDATE SKIP LOCKED
+        """, list(payment_moves)))
+        locked_payment_ids = {row[0] for row in self.env.cr.fetchall()}
+        locked_move_ids -= {
+            move_id for payment_id, move_id in payment_moves.items()
+            if payment_id not in locked_payment_ids
+        }
 
-            except Exception as e:
-                errors.append(f"Move {move.name}: {str(e)}")
+        locked_moves = moves.filtered(lambda m: m.id in locked_move_ids)
+        return locked_moves, moves - locked_moves
+
+    def _get_partitions(self, moves):
+        """Split the moves into partitions, one per (source journal, target journal)
+
+        Partitions sharing a target journal are only independent without
+        reset_sequence, see AccountMoveChangeJournalJobChunk._lock_target_journal().
+        """
+        targets = {journal: self._get_target_journal(journal) for journal in moves.journal_id}
+        return list(moves.grouped(lambda m: (m.journal_id, targets[m.journal_id])).values())
+
+    def _prepare_execution(self, run=None):
+        """Objects shared by all the batches of one execution
+
+        The profiler, the revert snapshot and the payment target resolver are
+        created once, and so is the run recording the execution, created with
+        the first batch when not given, see _store_run().
+        """
+        return {
+            "profiler": ChangeJournalProfiler(self.env.cr),
+            "snapshot": ChangeJournalSnapshot(),
+            "resolver": PaymentTargetResolver(self.env),
+            "run": run or self.env["account.move.change.journal.run"],
+        }
+
+    def _process_change(self, moves, execution=None):
+        """Change the journal of the given moves, recording the execution as a run
+
+        A batch of a larger execution gets the execution shared with the other
+        batches, see _prepare_execution(), and its caller finishes it.
+
+        Returns the result dict of _execute_change(), plus the run under "run"
+        """
+        self.ensure_one()
+        own_execution = execution is None
+        if own_execution:
+            execution = self._prepare_execution()
+        start = time.perf_counter()
+        query_count = self.env.cr.sql_log_count
+        wizard = self.with_context(
+            change_journal_profiler=execution["profiler"],
+            change_journal_snapshot=execution["snapshot"],
+        )
+        if self.target_mode == "mapping":
+            result = wizard._execute_mapping(moves, execution["resolver"])
+        else:
+            result = wizard._execute_change(moves, execution["resolver"])
+
+        # A preview is rolled back anyway, keep the run only for real executions
+        if not self.env.context.get("change_journal_dry_run"):
+            self._store_run(
+                execution, result, time.perf_counter() - start, self.env.cr.sql_log_count - query_count,
+            )
+            result["run"] = execution["run"].sudo(False)
+        if own_execution:
+            self._finish_execution(execution, result)
+        return result
+
+    def _create_run(self):
+        """Create the run recording an execution
+
+        Written as superuser along with its stages and snapshot, users only
+        read runs, see _store_snapshot().
+        """
+        return self.env["account.move.change.journal.run"].sudo().create(self._prepare_run_values())
+
+    def _store_run(self, execution, result, duration, query_count):
+        """Add the result, the measures and the snapshot of a batch to the run of the execution
+
+        The stored measures and snapshot rows are dropped from the execution,
+        so they do not pile up in memory over the batches.
+        """
+        run = execution["run"].sudo()
+        if not run:
+            run = execution["run"] = self._create_run()
+        run.write(self._prepare_run_batch_values(
+            run, result, execution["profiler"], duration, query_count,
+        ))
+        run._store_snapshot(execution["snapshot"])
+        execution["profiler"].reset()
+        execution["snapshot"].reset()
+
+    def _finish_execution(self, execution, result):
+        """Log the measures of an execution once all its batches are done and
+        post its summary message, see _post_audit_summary()
+        """
+        self._log_resolver_stats(execution["resolver"])
+        if execution["run"]:
+            self._log_profiling(execution["run"])
+        self._post_audit_summary(result)
+
+    def _execute_mapping(self, moves, resolver):
+        """Apply the change for _process_change() in mapping mode
+
+        The moves are grouped by target journal, so the sources sharing a
+        target are renumbered together, and each group is changed with its
+        target passed in the context key change_journal_target_id. All the
+        groups share the payment resolver, the profiler and the snapshot of
+        the execution.
+        """
+        self.ensure_one()
+        mapping = self._get_journal_mapping()
+        moves = moves.filtered(lambda m: m.journal_id in mapping)
+        results = [
+            self.with_context(change_journal_target_id=journal_to.id)._execute_change(group, resolver)
+            for journal_to, group in moves.grouped(lambda m: mapping[m.journal_id]).items()
+        ]
+        result = self._merge_results(results)
+        del result["runs"]
+        return result
+
+    def _execute_change(self, moves, resolver):
+        """Apply the change for _process_change()
+
+        With lock_records, each source journal partition is locked up front
+        and runs in its own savepoint, see _lock_records(). With
+        isolate_failures, the failing moves are left unchanged, see
+        _apply_change_isolated().
+
+        Returns a dict with the changed moves, the changed payments, the
+        skipped moves, the number of partial and full reconciles removed, the
+        error messages and under "failures" the moves left unchanged.
+        """
+        self.ensure_one()
+        unreconcile_stats = {"partial_count": 0, "full_reconcile_count": 0}
+        skipped_moves = self.env["account.move"]
+        failures = []
+
+        def apply_change(moves, stats):
+            if self.isolate_failures:
+                return self._apply_change_isolated(moves, stats, resolver, failures)
+            return self._apply_change(moves, stats, resolver)
+
+        if not self.lock_records:
+            changed_moves, changed_payments, errors = apply_change(moves, unreconcile_stats)
+        else:
+            moves, skipped_moves = self._lock_records(moves)
+            changed_moves = self.env["account.move"]
+            changed_payments = self.env["account.payment"]
+            errors = []
+            for partition in self._get_partitions(moves):
+                partition_stats = {"partial_count": 0, "full_reconcile_count": 0}
+                checkpoint = self._snapshot_checkpoint()
+                failure_count = len(failures)
+                try:
+                    with self.env.cr.savepoint():
+                        partition_moves, partition_payments, partition_errors = apply_change(
+                            partition, partition_stats
+                        )
+                except (LockNotAvailable, SerializationFailure):
+                    self._snapshot_restore(checkpoint)
+                    del failures[failure_count:]
+                    skipped_moves |= partition
+                    continue
+                changed_moves |= partition_moves
+                changed_payments |= partition_payments
+                errors += partition_errors
+                for key, value in partition_stats.items():
+                    unreconcile_stats[key] += value
+
+        result = {
+            "changed_moves": changed_moves,
+            "changed_payments": changed_payments,
+            "skipped_moves": skipped_moves,
+            "errors": errors,
+            "failures": failures,
+            **unreconcile_stats,
+        }
+        return result
+
+    def _get_result_action(self, result):
+        """Notify the user about the result of the change, raising if there were errors"""
+        changed_moves = result["changed_moves"]
+        changed_payments = result["changed_payments"]
+        errors = result["errors"]
+        skipped_moves = result.get("skipped_moves")
+        if skipped_moves:
+            errors = errors + [
+                _("Move %s: skipped, it is being modified by another transaction.") % move.name
+                for move in skipped_moves
+            ]
+
+        if errors and self.isolate_failures:
+            return self._get_partial_result_action(result, errors)
 
-        # Show results
         if errors:
             error_msg = _("Some moves/payments could not be changed:\n") + "\n".join(errors)
             if changed_moves or changed_payments:
@@ -449,12 +1617,18 @@ class AccountMoveChangeJournal(models.TransientModel):
         # Success message
         message = _("%s move(s) successfully changed to journal '%s'.") % (
             len(changed_moves),
-            self.journal_to_id.name,
+            ", ".join(self._get_target_journals().mapped("name")),
         )
 
         if changed_payments:
             message += _("\n%s related payment(s) also changed.") % len(changed_payments)
 
+        if result.get("partial_count"):
+            message += _("\n%s partial reconcile(s) and %s full reconcile(s) removed.") % (
+                result["partial_count"],
+                result["full_reconcile_count"],
+            )
+
         return {
             "type": "ir.actions.client",
             "tag": "display_notification",
@@ -465,3 +1639,326 @@ class AccountMoveChangeJournal(models.TransientModel):
                 "sticky": False,
             },
         }
+
+    def _get_partial_result_action(self, result, errors):
+        """Notify the user about a change that kept its successes despite failures"""
+        message = _("%s move(s) and %s payment(s) changed to journal '%s', %s move(s) left unchanged:\n") % (
+            len(result["changed_moves"]),
+            len(result["changed_payments"]),
+            ", ".join(self._get_target_journals().mapped("name")),
+            len(result.get("failures", [])) + len(result.get("skipped_moves") or []),
+        ) + "\n".join(errors)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Partially Changed"),
+                "message": message,
+                "type": "warning",
+                "sticky": True,
+            },
+        }
+
+    @api.model
+    def _merge_results(self, results):
+        """Merge the results of several _process_change() calls into one"""
+        merged = {
+            "changed_moves": self.env["account.move"],
+            "changed_payments": self.env["account.payment"],
+            "skipped_moves": self.env["account.move"],
+            "errors": [],
+            "failures": [],
+            "partial_count": 0,
+            "full_reconcile_count": 0,
+            "runs": self.env["account.move.change.journal.run"],
+        }
+        for result in results:
+            for key in ("changed_moves", "changed_payments", "skipped_moves"):
+                merged[key] |= result[key]
+            merged["errors"] += result["errors"]
+            merged["failures"] += result.get("failures", [])
+            merged["partial_count"] += result["partial_count"]
+            merged["full_reconcile_count"] += result["full_reconcile_count"]
+            merged["runs"] |= result.get("run", self.env["account.move.change.journal.run"])
+        return merged
+
+    def action_change_journal(self):
+        """Execute the journal change"""
+        self.ensure_one()
+        self._validate_change()
+
+        if self.selection_mode == "domain":
+            result = self._process_in_batches()
+            if not result["changed_moves"] and not result["errors"] and not result["skipped_moves"]:
+                raise UserError(_("No moves to change. All moves already belong to the target journal."))
+            return self._get_result_action(result)
+
+        moves_to_change = self._get_moves_to_change()
+
+        if not moves_to_change:
+            raise UserError(_("No moves to change. All moves already belong to the target journal."))
+
+        result = self._process_change(moves_to_change)
+        return self._get_result_action(result)
+
+    def _process_in_batches(self):
+        """Change the selected moves batch by batch of chunk_size
+
+        The ids are streamed from the database instead of loading the whole
+        selection, see _iter_moves_to_change().
+
+        Returns the merged result of the batches, see _merge_results().
+        """
+        self.ensure_one()
+        if self.chunk_size <= 0:
+            raise UserError(_("The chunk size must be greater than zero."))
+        # A single execution, and run, for all the batches
+        execution = self._prepare_execution()
+        results = []
+        for moves in self._iter_moves_to_change(self.chunk_size):
+            results.append(self._process_change(moves, execution))
+            self.env.invalidate_all()
+        result = self._merge_results(results)
+        self._finish_execution(execution, result)
+        return result
+
+    @api.model
+    def api_change_journal(self, journal_id, move_ids=None, domain=None, options=None):
+        """Change the journal of moves from an integration (XML-RPC / JSON-RPC)
+
+        The moves are given as a list of ids or as a domain, and ``options``
+        may set any of the wizard options in API_OPTIONS. The change always
+        runs with the bulk engine in domain mode, without the warnings and
+        the notification of the wizard, and by default keeps the successful
+        changes when some moves fail (isolate_failures). Without
+        isolate_failures, any error raises and rolls everything back, as in
+        the wizard.
+
+        Returns a dict with the batch reference, one outcome per move
+        ("changed", "skipped" or "failed"), the ids of the changed payments,
+        the errors, the number of reconciles removed and the timing of the
+        runs per stage.
+        """
+        options = dict(options or {})
+        unknown = set(options) - API_OPTIONS
+        if unknown:
+            raise UserError(_("Unknown options: %s") % ", ".join(sorted(unknown)))
+        if move_ids is None and domain is None:
+            raise UserError(_("Please give the moves to change, as a list of ids or as a domain."))
+        if move_ids is not None:
+            domain = [("id", "in", list(move_ids))]
+
+        wizard = self.with_context(active_ids=[], active_domain=None).create({
+            "selection_mode": "domain",
+            "move_domain": repr(domain),
+            "journal_to_id": journal_id,
+            "bulk_mode": True,
+            "isolate_failures": True,
+            **options,
+        })
+        wizard._validate_change()
+        result = wizard._process_in_batches()
+        if result["errors"] and not wizard.isolate_failures:
+            # Roll back the whole change, as the wizard does
+            raise UserError(
+                _("Some moves/payments could not be changed:\n") + "\n".join(result["errors"])
+            )
+        return wizard._get_api_result(result)
+
+    def _get_api_result(self, result):
+        """Machine-readable version of a merged result, see api_change_journal()"""
+        self.ensure_one()
+        moves = [
+            {"id": move.id, "status": "changed", "name": move.name, "reasons": []}
+            for move in result["changed_moves"]
+        ]
+        moves += [
+            {"id": move.id, "status": "skipped", "name": move.name,
+             "reasons": [_("Locked by another transaction.")]}
+            for move in result["skipped_moves"]
+        ]
+        moves += [
+            {"id": failure["move_id"], "status": "failed", "name": failure["name"],
+             "reasons": failure["reasons"]}
+            for failure in result["failures"]
+        ]
+
+        runs = result["runs"]
+        stages = {}
+        for stage in runs.stage_ids:
+            values = stages.setdefault(stage.name, {
+                "duration": 0.0, "query_count": 0, "row_count": 0, "call_count": 0, "peak_memory": 0,
+            })
+            values["duration"] += stage.duration
+            values["query_count"] += stage.query_count
+            values["row_count"] += stage.row_count
+            values["call_count"] += stage.call_count
+            values["peak_memory"] = max(values["peak_memory"], stage.peak_memory)
+
+        return {
+            "batch_ref": self.batch_ref,
+            "moves": moves,
+            "changed_payment_ids": result["changed_payments"].ids,
+            "errors": result["errors"],
+            "partial_count": result["partial_count"],
+            "full_reconcile_count": result["full_reconcile_count"],
+            "run_ids": runs.ids,
+            "duration": sum(runs.mapped("duration")),
+            "query_count": sum(runs.mapped("query_count")),
+            "stages": stages,
+        }
+
+    def _get_preview_rows(self, moves):
+        """Compute the plan of the change without keeping any modification
+
+        The change is run with the options of the wizard inside a savepoint
+        that is always rolled back, so the new numbers, payment method lines
+        and receiptbooks are exactly the ones a real execution would produce.
+
+        Returns the list of rows of the impact report.
+        """
+        self.ensure_one()
+        payments = self._get_related_payments(moves).filtered(
+            lambda p: p.journal_id != self._get_target_journal(p.move_id.journal_id)
+        )
+        has_receiptbook = "receiptbook_id" in payments._fields
+        partial_counts = defaultdict(int)
+        for payment_id, __, __ in self._get_payment_partials(payments):
+            partial_counts[payment_id] += 1
+
+        rows = []
+        try:
+            with self.env.cr.savepoint():
+                old_moves = self._get_audit_old_values(moves)
+                old_payments = self._get_audit_old_values(payments)
+                result = self.with_context(change_journal_dry_run=True)._process_change(moves)
+
+                for payment in result["changed_payments"]:
+                    old = old_payments[payment.id]
+                    rows.append([
+                        "payment", payment.id, old["name"],
+                        old["journal"].display_name, payment.journal_id.display_name,
+                        old["name"], payment.name,
+                        old["payment_method_line"].display_name, payment.payment_method_line_id.display_name,
+                        payment.receiptbook_id.display_name if has_receiptbook else "",
+                        partial_counts[payment.id], "",
+                    ])
+                for move in result["changed_moves"]:
+                    old = old_moves[move.id]
+                    rows.append([
+                        "move", move.id, old["name"],
+                        old["journal"].display_name, move.journal_id.display_name,
+                        old["name"], move.name,
+                        "", "", "", "", "",
+                    ])
+                for error in result["errors"]:
+                    rows.append(["error", "", "", "", "", "", "", "", "", "", "", error])
+                raise _DryRunRollback()
+        except _DryRunRollback:
+            pass
+        self.env.invalidate_all()
+        return rows
+
+    def action_preview_change(self):
+        """Download a report of what the journal change would do, without doing it"""
+        self.ensure_one()
+        self._validate_change()
+
+        moves_to_change = self._get_moves_to_change()
+
+        if not moves_to_change:
+            raise UserError(_("No moves to change. All moves already belong to the target journal."))
+
+        rows = self._get_preview_rows(moves_to_change)
+
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow([
+            _("Type"), _("ID"), _("Record"),
+            _("Current Journal"), _("New Journal"),
+            _("Current Number"), _("New Number"),
+            _("Current Payment Method"), _("New Payment Method"),
+            _("New Receiptbook"), _("Partials to Unlink"), _("Error"),
+        ])
+        writer.writerows(rows)
+
+        attachment = self.env["ir.attachment"].create({
+            "name": _("journal_change_preview_%s.csv") % self.batch_ref,
+            "raw": output.getvalue().encode("utf-8"),
+            "mimetype": "text/csv",
+            "res_model": self._name,
+            "res_id": self.id,
+        })
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/web/content/{attachment.id}?download=true",
+            "target": "self",
+        }
+
+    def _prepare_job_values(self, moves, journal_to):
+        """Prepare the values of the background job changing the given moves to journal_to"""
+        job_model = self.env["account.move.change.journal.job"]
+        return {
+            "name": _("Change %s move(s) to journal '%s'") % (len(moves), journal_to.name),
+            "company_id": self.company_id.id,
+            "journal_to_id": journal_to.id,
+            "reset_sequence": self.reset_sequence,
+            "force_change": self.force_change,
+            "bulk_mode": self.bulk_mode,
+            "lock_records": self.lock_records,
+            "isolate_failures": self.isolate_failures,
+            "audit_mode": self.audit_mode,
+            "audit_summary": self.audit_summary,
+            "batch_ref": self.batch_ref,
+            "chunk_size": self.chunk_size,
+            "move_count": len(moves),
+            "chunk_ids": job_model._prepare_chunk_values(moves.ids, self.chunk_size),
+        }
+
+    def action_change_journal_background(self):
+        """Queue the journal change as a background job processed by cron"""
+        self.ensure_one()
+        self._validate_change()
+
+        if self.chunk_size <= 0:
+            raise UserError(_("The chunk size must be greater than zero."))
+
+        moves_to_change = self._get_moves_to_change()
+
+        if not moves_to_change:
+            raise UserError(_("No moves to change. All moves already belong to the target journal."))
+
+        # With lock_records, one job per (source journal, target journal)
+        # partition so that several cron workers can process them in parallel.
+        # In mapping mode each source journal has its own target, so one job
+        # per partition as well.
+        if self.target_mode == "mapping" or self.lock_records:
+            partitions = [
+                (partition, self._get_target_journal(partition.journal_id))
+                for partition in self._get_partitions(moves_to_change)
+            ]
+        else:
+            partitions = [(moves_to_change, self.journal_to_id)]
+        # Users only read jobs, so that the user, the options and the moves
+        # of a job cannot be changed after this validation
+        jobs = self.env["account.move.change.journal.job"].sudo().create([
+            self._prepare_job_values(partition, journal_to) for partition, journal_to in partitions
+        ]).sudo(False)
+        jobs._trigger_processing()
+
+        if len(jobs) == 1:
+            return {
+                "type": "ir.actions.act_window",
+                "res_model": "account.move.change.journal.job",
+                "res_id": jobs.id,
+                "view_mode": "form",
+                "target": "current",
+            }
+        return {
+            "type": "ir.actions.act_window",
+            "name": _("Journal Change Jobs"),
+            "res_model": "account.move.change.journal.job",
+            "domain": [("id", "in", jobs.ids)],
+            "view_mode": "list,form",
+            "target": "current",
+        }
@@ -0,0 +1,39 @@
+from odoo import api, fields, models
+
+
+class AccountMoveChangeJournalMapping(models.TransientModel):
+    _name = "account.move.change.journal.mapping"
+    _description = "Change Journal Mapping Line"
+
+    wizard_id = fields.Many2one(
+        "account.move.change.journal",
+        string="Wizard",
+        required=True,
+        ondelete="cascade",
+    )
+    journal_from_id = fields.Many2one(
+        "account.journal",
+        string="Source Journal",
+        required=True,
+    )
+    journal_to_id = fields.Many2one(
+        "account.journal",
+        string="Target Journal",
+        help="Leave empty to keep the moves of the source journal unchanged",
+    )
+    available_journal_ids = fields.Many2many(
+        "account.journal",
+        compute="_compute_available_journal_ids",
+        help="Journals of the company of the same type as the source journal",
+    )
+
+    @api.depends("journal_from_id", "wizard_id.company_id", "wizard_id.force_change")
+    def _compute_available_journal_ids(self):
+        Journal = self.env["account.journal"]
+        for line in self:
+            index = Journal._get_change_journal_compatibility(line.wizard_id.company_id.id)
+            line.available_journal_ids = Journal.browse([
+                journal_id
+                for journal_id, values in index.items()
+                if line.wizard_id.force_change or values["type"] == line.journal_from_id.type
+            ])
@@ -0,0 +1,49 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class ChangeJournalProfiler:
+    """Collect the wall time, SQL queries and rows touched per stage of a journal change
+
+    Stages may be entered several times (once per group or per record), their
+    measures are accumulated. The caller of a stage can add the number of rows
+    it touched to the dict yielded by stage(). While tracemalloc is tracing,
+    the peak of memory allocated inside each stage is measured too, the
+    highest one is kept; stages are not nested, as each one resets the peak.
+    """
+
+    def __init__(self, cr):
+        self.cr = cr
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the code run inside the context as part of the stage ``name``"""
+        measure = {"row_count": 0}
+        query_count = self.cr.sql_log_count
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield measure
+        finally:
+            stage = self.stages.setdefault(name, {
+                "duration": 0.0,
+                "query_count": 0,
+                "row_count": 0,
+                "call_count": 0,
+                "peak_memory": 0,
+            })
+            stage["duration"] += time.perf_counter() - start
+            stage["query_count"] += self.cr.sql_log_count - query_count
+            stage["row_count"] += measure["row_count"]
+            stage["call_count"] += 1
+            if tracing:
+                stage["peak_memory"] = max(stage["peak_memory"], tracemalloc.get_traced_memory()[1] - memory)
+
+    def reset(self):
+        """Drop the measures collected so far, once they have been stored"""
+        self.stages = {}
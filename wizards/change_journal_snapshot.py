@@ -0,0 +1,26 @@
+class ChangeJournalSnapshot:
+    """Collect the values needed to revert a journal change
+
+    Rows are kept in memory during the execution and written in batch with
+    the run. checkpoint() and restore() drop the rows collected inside a
+    savepoint that ends up rolled back.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.partials = []
+
+    def checkpoint(self):
+        """Current position of the collected rows"""
+        return len(self.records), len(self.partials)
+
+    def restore(self, checkpoint):
+        """Drop the rows collected since the checkpoint"""
+        record_count, partial_count = checkpoint
+        del self.records[record_count:]
+        del self.partials[partial_count:]
+
+    def reset(self):
+        """Drop all the collected rows, once they have been stored"""
+        self.records = []
+        self.partials = []
@@ -0,0 +1,102 @@
+from odoo import _
+
+
+class PaymentTargetResolver:
+    """Resolve the payment method line and receiptbook of payments moved to a journal
+
+    The answer only depends on (target journal, payment type, current payment
+    method code, partner type, internal transfer), so it is computed once per
+    key and served from memory for the rest of the execution. ``hits`` and
+    ``misses`` count how many payments were served from the table and how
+    many keys had to be computed.
+    """
+
+    def __init__(self, env):
+        self.env = env
+        self.hits = 0
+        self.misses = 0
+        self._targets = {}
+        self._method_lines = {}
+        self._receiptbooks = {}
+
+    def _get_method_lines(self, journal, payment_type):
+        """Available payment method lines of the journal, once per payment type"""
+        key = (journal.id, payment_type)
+        if key not in self._method_lines:
+            self._method_lines[key] = journal._get_available_payment_method_lines(payment_type)
+        return self._method_lines[key]
+
+    def _get_receiptbook_id(self, company, partner_type):
+        """Receiptbook of the company for the partner type, once per company"""
+        key = (company.id, partner_type)
+        if key not in self._receiptbooks:
+            receiptbook = self.env["account.payment.receiptbook"].search([
+                ("partner_type", "=", partner_type),
+                ("company_id", "=", company.id),
+            ], limit=1)
+            self._receiptbooks[key] = receiptbook.id
+        return self._receiptbooks[key]
+
+    def _compute(self, journal, payment_type, current_code, partner_type, is_internal_transfer):
+        """Resolve the target values for one key, see resolve()"""
+        available_method_lines = self._get_method_lines(journal, payment_type)
+
+        # Try to find a payment method with the same code that has an outstanding account,
+        # then with the same code, then any method with an outstanding account, then any method
+        with_account = available_method_lines.filtered(lambda l: l.payment_account_id)
+        candidates = []
+        if current_code:
+            candidates += [
+                with_account.filtered(lambda l: l.code == current_code),
+                available_method_lines.filtered(lambda l: l.code == current_code),
+            ]
+        candidates += [with_account, available_method_lines]
+        new_payment_method_line = next((lines[0] for lines in candidates if lines), False)
+
+        # Validate that we have a valid payment method
+        if not new_payment_method_line:
+            return False, False, _(
+                "The target journal '%s' has no payment methods configured for %s payments."
+            ) % (journal.name, payment_type)
+
+        # Check if the payment method has an outstanding account
+        # If not, check if the company has a default account we can use
+        company = journal.company_id
+        if not new_payment_method_line.payment_account_id:
+            if payment_type == 'inbound':
+                default_account = company.account_journal_payment_debit_account_id
+            else:
+                default_account = company.account_journal_payment_credit_account_id
+
+            if not default_account:
+                return False, False, _(
+                    "The payment method '%s' in journal '%s' has no outstanding account configured, "
+                    "and the company has no default outstanding account. "
+                    "Please configure the outstanding payments/receipts account in the journal or company settings."
+                ) % (new_payment_method_line.name, journal.name)
+
+        # Get the appropriate receiptbook for the new journal's company
+        new_receiptbook_id = False
+        if not is_internal_transfer and getattr(company, "use_receiptbook", False):
+            new_receiptbook_id = self._get_receiptbook_id(company, partner_type)
+
+        return new_payment_method_line, new_receiptbook_id, None
+
+    def resolve(self, journal, payment):
+        """Resolve the payment method line and receiptbook of the payment in the journal
+
+        Returns a tuple (payment_method_line, receiptbook_id, error)
+        """
+        key = (
+            journal.id,
+            payment.payment_type,
+            payment.payment_method_line_id.code,
+            payment.partner_type,
+            payment.is_internal_transfer,
+        )
+        if key in self._targets:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._targets[key] = self._compute(journal, *key[1:])
+        return self._targets[key]